@@ -4,139 +4,101 @@ Employee Management System - Web Interface
 A Flask web application with Bootstrap for managing employee records.
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
-import sqlite3
+from flask import (Flask, Response, abort, render_template, request, redirect, url_for, flash, jsonify,
+                   make_response, session)
 import os
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import io
+import json
+from functools import wraps
+
+from employee_search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from bulk_import import DEFAULT_BATCH_SIZE, detect_format
+from response_cache import ResponseCache
+from request_metrics import RequestMetrics, init_app as init_request_metrics
+from employee_store import EmployeeManager, optional_arg, parse_page_args, stats_payload
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this-in-production'
 
-class EmployeeManager:
-    def __init__(self, db_path: str = "employees.db"):
-        """Initialize the Employee Manager with database path."""
-        self.db_path = db_path
-        if not os.path.exists(db_path):
-            raise FileNotFoundError(f"Database file not found: {db_path}")
-    
-    def get_connection(self):
-        """Get a database connection."""
-        return sqlite3.connect(self.db_path)
-    
-    def get_departments(self) -> List[Dict[str, Any]]:
-        """Get all departments for display."""
-        with self.get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM departments ORDER BY id")
-            return [dict(row) for row in cursor.fetchall()]
-    
-    def get_employees(self) -> List[Dict[str, Any]]:
-        """Get all employees with department information."""
-        with self.get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT e.id, e.name, d.name as department, e.salary, e.hire_date, e.department_id
-                FROM employees e
-                LEFT JOIN departments d ON e.department_id = d.id
-                ORDER BY e.id
-            """)
-            return [dict(row) for row in cursor.fetchall()]
-    
-    def get_employee(self, employee_id: int) -> Optional[Dict[str, Any]]:
-        """Get a specific employee by ID."""
-        with self.get_connection() as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT e.id, e.name, d.name as department, e.salary, e.hire_date, e.department_id
-                FROM employees e
-                LEFT JOIN departments d ON e.department_id = d.id
-                WHERE e.id = ?
-            """, (employee_id,))
-            result = cursor.fetchone()
-            return dict(result) if result else None
-    
-    def create_employee(self, name: str, department_id: int, salary: float, hire_date: str) -> bool:
-        """Create a new employee record."""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO employees (name, department_id, salary, hire_date) 
-                    VALUES (?, ?, ?, ?)
-                """, (name, department_id, salary, hire_date))
-                conn.commit()
-                return True
-        except sqlite3.Error:
-            return False
-    
-    def update_employee(self, employee_id: int, name: str, department_id: int, salary: float, hire_date: str) -> bool:
-        """Update an existing employee record."""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE employees 
-                    SET name = ?, department_id = ?, salary = ?, hire_date = ?
-                    WHERE id = ?
-                """, (name, department_id, salary, hire_date, employee_id))
-                conn.commit()
-                return True
-        except sqlite3.Error:
-            return False
-    
-    def delete_employee(self, employee_id: int) -> bool:
-        """Delete an employee record."""
-        try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM employees WHERE id = ?", (employee_id,))
-                conn.commit()
-                return True
-        except sqlite3.Error:
-            return False
-
-# Initialize the employee manager
+# Page sizes offered on the index page
+INDEX_PAGE_SIZES = (25, 50, 100, 250)
+
+# Initialize the employee manager (EMPLOYEE_DB selects another database file,
+# e.g. one built by generate_employees.py)
 try:
-    employee_manager = EmployeeManager()
+    employee_manager = EmployeeManager(os.environ.get('EMPLOYEE_DB', 'employees.db'))
 except FileNotFoundError as e:
     print(f"Error: {e}")
     exit(1)
 
+# Rendered GET responses, invalidated by in-process writes and by
+# PRAGMA data_version changes from out-of-band writers
+response_cache = ResponseCache(employee_manager.pool.data_version)
+employee_manager.write_listeners.append(response_cache.invalidate)
+
+# Per-route latency, SQL and template metrics for /metrics; SERVER_TIMING=1 also
+# sends them to the browser in a Server-Timing header
+request_metrics = RequestMetrics()
+init_request_metrics(app, request_metrics,
+                     server_timing=os.environ.get('SERVER_TIMING', '').lower() in ('1', 'true', 'yes'))
+
+def cached_response(view):
+    """Serve a GET view from the response cache with an ETag, answering If-None-Match with 304."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Pages carrying flash messages are one-off and must not be cached
+        if request.method != 'GET' or session.get('_flashes'):
+            return view(*args, **kwargs)
+        
+        key = request.full_path
+        entry = response_cache.get(key)
+        if entry is None:
+            version = response_cache.version()
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            entry = response_cache.put(key, response.get_data(), response.mimetype, version)
+        
+        response = Response(entry.body, mimetype=entry.mimetype)
+        response.set_etag(entry.etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    return wrapper
+
 @app.route('/')
+@cached_response
 def index():
-    """Home page - display all employees."""
-    employees = employee_manager.get_employees()
+    """Home page - one keyset page of employees plus dashboard statistics."""
+    try:
+        page_args = parse_page_args(request.args)
+        page = employee_manager.get_employees_page(**page_args)
+    except ValueError as e:
+        abort(400, description=str(e))
+    # Query args that every sort, page-size and pager link carries forward
+    link_args = {name: value for name, value in page_args.items()
+                 if value is not None and name not in ('after', 'before')}
+    # Infinite scroll fetches the following pages from the JSON API with the same arguments
+    api_url = url_for('api_employees', **link_args)
+    if request.args.get('scroll') == '1':
+        link_args['scroll'] = 1
     departments = employee_manager.get_departments()
-    
-    # Calculate statistics
-    avg_salary = 0
-    new_this_year = 0
-    department_counts = {}
-    
-    if employees:
-        # Calculate average salary
-        total_salary = sum(emp['salary'] for emp in employees)
-        avg_salary = total_salary / len(employees)
-        
-        # Count employees hired this year
-        current_year = datetime.now().year
-        new_this_year = sum(1 for emp in employees if emp['hire_date'].startswith(str(current_year)))
-        
-        # Count employees per department
-        for emp in employees:
-            dept_id = emp['department_id']
-            department_counts[dept_id] = department_counts.get(dept_id, 0) + 1
+    stats = employee_manager.get_dashboard_stats()
     
     return render_template('index.html', 
-                         employees=employees, 
+                         employees=page['employees'], 
+                         page=page,
+                         link_args=link_args,
+                         page_sizes=INDEX_PAGE_SIZES,
+                         infinite_scroll='scroll' in link_args,
+                         # The dashboard total is unfiltered, so it can't label a filtered list
+                         filtered=any(page_args[name] is not None
+                                      for name in ('department_id', 'min_salary', 'max_salary')),
+                         api_url=api_url,
                          departments=departments,
-                         avg_salary=avg_salary,
-                         new_this_year=new_this_year,
-                         department_counts=department_counts)
+                         total_employees=stats['total_employees'],
+                         avg_salary=stats['avg_salary'],
+                         new_this_year=stats['new_this_year'],
+                         department_counts=stats['department_counts'])
 
 @app.route('/create', methods=['GET', 'POST'])
 def create_employee():
@@ -219,6 +181,7 @@ def delete_employee(employee_id):
     return redirect(url_for('index'))
 
 @app.route('/racing')
+@cached_response
 def racing_game():
     """Racing game page."""
     employees = employee_manager.get_employees()
@@ -226,10 +189,135 @@ def racing_game():
     return render_template('racing.html', employees=employees, departments=departments)
 
 @app.route('/api/employees')
+@cached_response
 def api_employees():
-    """API endpoint to get all employees as JSON."""
-    employees = employee_manager.get_employees()
-    return jsonify(employees)
+    """API endpoint to get employees as JSON, one keyset page at a time.
+    
+    Pass after=next_cursor for the following page or before=prev_cursor for
+    the preceding one. Pass all=1 to get the full unpaginated list.
+    """
+    if request.args.get('all', '').lower() in ('1', 'true', 'yes'):
+        return jsonify(employee_manager.get_employees())
+    
+    try:
+        page = employee_manager.get_employees_page(**parse_page_args(request.args))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    return jsonify(page)
+
+@app.route('/api/employees/<int:employee_id>')
+def api_employee(employee_id: int):
+    """API endpoint to get one employee as JSON."""
+    employee = employee_manager.get_employee(employee_id)
+    if employee is None:
+        return jsonify({"error": "Employee not found"}), 404
+    return jsonify(employee)
+
+@app.route('/api/stats')
+def api_stats():
+    """API endpoint for the dashboard statistics."""
+    return jsonify(stats_payload(employee_manager.get_dashboard_stats()))
+
+@app.route('/api/employees/stream')
+def api_employees_stream():
+    """API endpoint streaming every employee as NDJSON (default) or a chunked JSON array."""
+    output_format = request.args.get('format', 'ndjson').lower()
+    if output_format not in ('ndjson', 'json'):
+        return jsonify({"error": "format must be 'ndjson' or 'json'"}), 400
+    
+    def generate_ndjson():
+        for employee in employee_manager.iter_employees():
+            yield json.dumps(employee) + '\n'
+    
+    def generate_json_array():
+        yield '['
+        first = True
+        for employee in employee_manager.iter_employees():
+            yield ('' if first else ',') + json.dumps(employee)
+            first = False
+        yield ']'
+    
+    if output_format == 'ndjson':
+        return Response(generate_ndjson(), mimetype='application/x-ndjson')
+    return Response(generate_json_array(), mimetype='application/json')
+
+@app.route('/api/employees/search')
+@cached_response
+def api_employees_search():
+    """API endpoint for ranked prefix search over employee and department names."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Query parameter q is required"}), 400
+    try:
+        limit = _optional_arg('limit', int)
+        if limit is None:
+            limit = DEFAULT_SEARCH_LIMIT
+        if not 1 <= limit <= MAX_SEARCH_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_SEARCH_LIMIT}")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    results = employee_manager.search_employees(query, limit)
+    return jsonify({"query": query, "employees": results})
+
+@app.route('/api/employees/bulk', methods=['POST'])
+def api_employees_bulk():
+    """API endpoint to bulk-import employees from a CSV or NDJSON request body."""
+    input_format = request.args.get('format') or detect_format(content_type=request.content_type or '')
+    if input_format not in ('csv', 'ndjson'):
+        return jsonify({"error": "Specify format=csv or format=ndjson (or a matching Content-Type)"}), 400
+    
+    try:
+        batch_size = _optional_arg('batch_size', int)
+        if batch_size is None:
+            batch_size = DEFAULT_BATCH_SIZE
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    # Parse the body as a stream instead of loading it into memory
+    lines = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+    try:
+        report = employee_manager.bulk_import(lines, input_format, batch_size)
+    except UnicodeDecodeError:
+        return jsonify({"error": "Request body must be UTF-8 text"}), 400
+    except TimeoutError as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify(report)
+
+def _optional_arg(name: str, convert):
+    """Read an optional query argument from the current request, raising ValueError if it does not convert."""
+    return optional_arg(request.args, name, convert)
+
+@app.route('/api/pool')
+def api_pool():
+    """API endpoint exposing connection pool counters for monitoring."""
+    return jsonify(employee_manager.pool.stats())
+
+@app.route('/api/cache')
+def api_cache():
+    """API endpoint exposing response cache counters for monitoring."""
+    return jsonify(response_cache.stats())
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics: request latency, SQL time and statements, rows, render time."""
+    pool = employee_manager.pool.stats()
+    cache = response_cache.stats()
+    samples = [
+        ('db_pool_connections', 'gauge', "Pooled database connections by state", {'state': 'in_use'}, pool['in_use']),
+        ('db_pool_connections', 'gauge', "Pooled database connections by state", {'state': 'idle'}, pool['idle']),
+        ('db_pool_waits_total', 'counter', "Checkouts that had to wait for a free connection", {}, pool['waits']),
+        ('response_cache_entries', 'gauge', "Cached rendered responses", {}, cache['entries']),
+        ('response_cache_lookups_total', 'counter', "Response cache lookups by result", {'result': 'hit'}, cache['hits']),
+        ('response_cache_lookups_total', 'counter', "Response cache lookups by result", {'result': 'miss'}, cache['misses']),
+    ]
+    return Response(request_metrics.render(samples), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # The debugger allows running code from the browser, so it is opt-in;
+    # for production serving of the read API use asgi_app.py
+    debug = os.environ.get('FLASK_DEBUG', '').lower() in ('1', 'true', 'yes')
+    app.run(debug=debug, host='0.0.0.0', port=5000, threaded=True)
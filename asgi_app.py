@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Employee Read API - ASGI Server
+Serves the read-only JSON API from an asyncio event loop, with SQLite work on a pool of reader threads.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from employee_store import EmployeeManager, parse_page_args, stats_payload
+from response_cache import ResponseCache
+
+DEFAULT_READERS = 8
+DEFAULT_VERSION_POLL_SECONDS = 0.1
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+
+Handler = Callable[..., Awaitable[Tuple[int, Any]]]
+
+class EmployeeReadAPI:
+    def __init__(self, db_path: str = "employees.db", readers: int = DEFAULT_READERS,
+                 version_poll_seconds: float = DEFAULT_VERSION_POLL_SECONDS):
+        """Initialize the API over db_path.
+
+        Database calls run on an executor of readers threads, each of which
+        borrows one of readers mode=ro pooled connections, so the event loop
+        never blocks on SQLite. PRAGMA data_version is polled every
+        version_poll_seconds to invalidate the response cache.
+        """
+        if readers < 1:
+            raise ValueError("readers must be at least 1")
+        self.manager = EmployeeManager(db_path, pool_size=readers, read_only=True)
+        self.executor = ThreadPoolExecutor(max_workers=readers, thread_name_prefix='db-reader')
+        self.version_poll_seconds = version_poll_seconds
+        self._data_version: Optional[int] = None
+        self._poller: Optional[asyncio.Task] = None
+        # Polling clients mostly ask for the same few pages, so serve them from memory
+        self.response_cache = ResponseCache(lambda: self._data_version)
+        self.routes: List[Tuple[re.Pattern, Handler]] = [
+            (re.compile(r'/api/employees'), self.employees),
+            (re.compile(r'/api/employees/(\d+)'), self.employee),
+            (re.compile(r'/api/stats'), self.stats),
+        ]
+
+    async def run_db(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking EmployeeManager call on the reader executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+
+    async def startup(self):
+        """Start polling the data version (once)."""
+        if self._poller is not None:
+            return
+        self._poller = asyncio.ensure_future(self._poll_data_version())
+
+    async def shutdown(self):
+        """Stop polling and close the reader threads and connections."""
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        self.executor.shutdown(wait=True)
+        self.manager.pool.close()
+
+    async def _poll_data_version(self):
+        """Keep _data_version current; the response cache reads it without touching SQLite."""
+        while True:
+            self._data_version = await self.run_db(self.manager.pool.data_version)
+            await asyncio.sleep(self.version_poll_seconds)
+
+    async def employees(self, args: Dict[str, str]) -> Tuple[int, Any]:
+        """GET /api/employees - one keyset page, with the same arguments as the Flask API."""
+        page = await self.run_db(self.manager.get_employees_page, **parse_page_args(args))
+        return 200, page
+
+    async def employee(self, args: Dict[str, str], employee_id: str) -> Tuple[int, Any]:
+        """GET /api/employees/<id> - one employee."""
+        employee = await self.run_db(self.manager.get_employee, int(employee_id))
+        if employee is None:
+            return 404, {"error": "Employee not found"}
+        return 200, employee
+
+    async def stats(self, args: Dict[str, str]) -> Tuple[int, Any]:
+        """GET /api/stats - the dashboard statistics."""
+        return 200, stats_payload(await self.run_db(self.manager.get_dashboard_stats))
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        """ASGI entry point."""
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            # Servers without lifespan support start polling on the first request
+            await self.startup()
+            await self._http(scope, send)
+
+    async def _lifespan(self, receive: Callable, send: Callable):
+        """Handle the ASGI lifespan protocol."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await self.startup()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope: Dict[str, Any], send: Callable):
+        """Route one HTTP request and send the JSON response."""
+        if scope['method'] != 'GET':
+            await self._send_json(send, 405, {"error": "Method not allowed"}, [(b'allow', b'GET')])
+            return
+
+        path = scope['path']
+        for pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                break
+        else:
+            await self._send_json(send, 404, {"error": "Not found"})
+            return
+
+        key = path + '?' + scope['query_string'].decode('latin-1')
+        # Until the first data version is known nothing can be cached safely
+        cacheable = self._data_version is not None
+        entry = self.response_cache.get(key) if cacheable else None
+        if entry is None:
+            version = self.response_cache.version()
+            args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+            try:
+                status, payload = await handler(args, *match.groups())
+            except ValueError as e:
+                status, payload = 400, {"error": str(e)}
+            if status != 200 or not cacheable:
+                await self._send_json(send, status, payload)
+                return
+            body = json.dumps(payload, sort_keys=True).encode()
+            entry = self.response_cache.put(key, body, 'application/json', version)
+
+        etag = f'"{entry.etag}"'.encode()
+        headers = [(b'etag', etag), (b'cache-control', b'no-cache')]
+        if_none_match = dict(scope['headers']).get(b'if-none-match', b'')
+        if etag in [tag.strip() for tag in if_none_match.split(b',')]:
+            await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        await self._send(send, 200, entry.body, headers)
+
+    async def _send_json(self, send: Callable, status: int, payload: Any,
+                         headers: Optional[List[Tuple[bytes, bytes]]] = None):
+        """Send an uncached JSON response."""
+        await self._send(send, status, json.dumps(payload, sort_keys=True).encode(), headers or [])
+
+    async def _send(self, send: Callable, status: int, body: bytes, headers: List[Tuple[bytes, bytes]]):
+        """Send a complete response with a JSON body."""
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'),
+                        (b'content-length', str(len(body)).encode())] + headers,
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+def create_app() -> EmployeeReadAPI:
+    """Build the API from EMPLOYEE_DB and ASGI_READERS (for uvicorn --factory asgi_app:create_app)."""
+    return EmployeeReadAPI(os.environ.get('EMPLOYEE_DB', 'employees.db'),
+                           readers=int(os.environ.get('ASGI_READERS', DEFAULT_READERS)))
+
+def main(argv=None):
+    """Command-line entry point: serve the read API with uvicorn."""
+    parser = argparse.ArgumentParser(description="Serve the read-only employee JSON API with uvicorn")
+    parser.add_argument('--db', default=os.environ.get('EMPLOYEE_DB', 'employees.db'),
+                        help="Database file to serve (default: $EMPLOYEE_DB or employees.db)")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Interface to bind (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--readers', type=int, default=DEFAULT_READERS,
+                        help=f"Reader threads and connections per process (default: {DEFAULT_READERS})")
+    parser.add_argument('--workers', type=int, default=1, help="Server processes (default: 1)")
+    parser.add_argument('--access-log', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    if args.readers < 1 or args.workers < 1:
+        parser.error("--readers and --workers must be at least 1")
+    if not os.path.exists(args.db):
+        parser.error(f"Database file not found: {args.db}")
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ uvicorn is not installed - run: pip install -r requirements.txt")
+        return 1
+
+    # Worker processes build their own app from the environment
+    os.environ['EMPLOYEE_DB'] = args.db
+    os.environ['ASGI_READERS'] = str(args.readers)
+    uvicorn.run('asgi_app:create_app', factory=True, host=args.host, port=args.port,
+                workers=args.workers, access_log=args.access_log)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Data Layer Benchmarks
+Times the web, MCP and CLI hot paths against generated databases and writes JSON results.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from generate_employees import DEFAULT_DEPARTMENTS, DEFAULT_SEED, generate_database, parse_count
+
+DEFAULT_SIZES = '10k,100k'
+DEFAULT_DATA_DIR = 'benchmark_data'
+DEFAULT_REPEAT = 20
+DEFAULT_MAX_SECONDS = 10.0
+MIN_ITERATIONS = 3
+
+def time_call(fn: Callable[[], Any], repeat: int, max_seconds: float) -> Dict[str, Any]:
+    """Run fn once to warm up, then up to repeat times, returning latency statistics in ms.
+
+    Stops early once max_seconds have been spent (after MIN_ITERATIONS runs),
+    so slow cases on large databases still finish.
+    """
+    fn()
+    samples = []
+    budget_start = time.perf_counter()
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+        if len(samples) >= MIN_ITERATIONS and time.perf_counter() - budget_start > max_seconds:
+            break
+    ordered = sorted(samples)
+    mean = statistics.fmean(samples)
+    return {
+        "iterations": len(samples),
+        "min_ms": round(ordered[0], 4),
+        "median_ms": round(statistics.median(ordered), 4),
+        "mean_ms": round(mean, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "max_ms": round(ordered[-1], 4),
+        "ops_per_second": round(1000 / mean, 2) if mean > 0 else None,
+    }
+
+def web_benchmarks(db_path: str, rng: random.Random, max_id: int, departments: int) -> List[Tuple[str, Callable]]:
+    """Benchmarks for the Flask EmployeeManager and the index route."""
+    # app.py opens its database at import time
+    os.environ['EMPLOYEE_DB'] = db_path
+    import app as web
+
+    manager = web.employee_manager
+    client = web.app.test_client()
+
+    def index_uncached():
+        web.response_cache.invalidate()
+        response = client.get('/')
+        assert response.status_code == 200, response.status_code
+
+    def index_cached():
+        response = client.get('/')
+        assert response.status_code == 200, response.status_code
+
+    return [
+        ("web.get_employees", manager.get_employees),
+        ("web.get_employees_page", lambda: manager.get_employees_page(limit=50)),
+        ("web.get_employees_page_filtered", lambda: manager.get_employees_page(
+            limit=50, department_id=rng.randint(1, departments), sort='salary', order='desc')),
+        ("web.get_employee", lambda: manager.get_employee(rng.randint(1, max_id))),
+        ("web.get_dashboard_stats", manager.get_dashboard_stats),
+        ("web.search_employees", lambda: manager.search_employees('ali smi')),
+        ("web.index", index_uncached),
+        ("web.index_cached", index_cached),
+    ]
+
+def mcp_benchmarks(db_path: str, rng: random.Random, max_id: int) -> List[Tuple[str, Callable]]:
+    """Benchmarks for SimpleSQLiteMCPServer queries and schema introspection."""
+    from simple_mcp_server import SimpleSQLiteMCPServer
+
+    server = SimpleSQLiteMCPServer(db_path)
+
+    def query(sql: str, params=None, limit: int = 100, cached: bool = False):
+        if not cached:
+            server.result_cache.clear()
+        result = server.execute_query(sql, limit, params)
+        assert "error" not in result, result
+        if result.get("cursor_id"):
+            server.close_cursor(result["cursor_id"])
+
+    def schema_uncached():
+        server._schema_cache = None
+        server.get_schema()
+
+    aggregate = """
+        SELECT d.name, COUNT(*) AS employees, AVG(e.salary) AS avg_salary
+        FROM employees e JOIN departments d ON d.id = e.department_id
+        GROUP BY d.id
+    """
+    return [
+        ("mcp.execute_query.point_lookup", lambda: query("SELECT * FROM employees WHERE id = ?", [rng.randint(1, max_id)])),
+        ("mcp.execute_query.first_page", lambda: query("SELECT * FROM employees ORDER BY id")),
+        ("mcp.execute_query.aggregate", lambda: query(aggregate)),
+        ("mcp.execute_query.aggregate_cached", lambda: query(aggregate, cached=True)),
+        ("mcp.get_schema", server.get_schema),
+        ("mcp.get_schema_uncached", schema_uncached),
+    ]
+
+def cli_benchmarks(db_path: str, rng: random.Random, max_id: int) -> List[Tuple[str, Callable]]:
+    """Benchmarks for the terminal EmployeeManager listing paths."""
+    from employee_manager import EmployeeManager
+
+    manager = EmployeeManager(db_path)
+    sink = open(os.devnull, 'w')
+
+    return [
+        ("cli.list_employees", lambda: manager.list_employees('table', out=sink)),
+        ("cli.export_ndjson", lambda: manager.list_employees('ndjson', out=sink)),
+        ("cli.fetch_employee_page", lambda: manager.fetch_employee_page(after_id=rng.randint(0, max_id))),
+        ("cli.count_employees", manager.count_employees),
+    ]
+
+def run_database(db_path: str, repeat: int, max_seconds: float, only: Optional[str], seed: int) -> List[Dict[str, Any]]:
+    """Run every benchmark against one database in this process."""
+    with sqlite3.connect(db_path) as conn:
+        max_id = conn.execute("SELECT IFNULL(MAX(id), 1) FROM employees").fetchone()[0]
+        employees = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+        departments = conn.execute("SELECT COUNT(*) FROM departments").fetchone()[0]
+
+    rng = random.Random(seed)
+    cases = (web_benchmarks(db_path, rng, max_id, departments)
+             + mcp_benchmarks(db_path, rng, max_id)
+             + cli_benchmarks(db_path, rng, max_id))
+
+    results = []
+    for name, fn in cases:
+        if only and not name.startswith(only):
+            continue
+        print(f"  ⏱️  {name}", file=sys.stderr)
+        results.append(dict({"database": db_path, "employees": employees, "benchmark": name},
+                            **time_call(fn, repeat, max_seconds)))
+    return results
+
+def run_sizes(sizes: List[int], args) -> List[Dict[str, Any]]:
+    """Generate (or reuse) one database per size and benchmark each in a fresh process."""
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+    for size in sizes:
+        db_path = os.path.join(args.data_dir, f"employees_{size}_d{args.departments}_s{args.seed}.db")
+        if not os.path.exists(db_path):
+            print(f"🏗️  Generating {size:,} employees -> {db_path}", file=sys.stderr)
+            generate_database(db_path, size, args.departments, args.seed)
+        print(f"📊 Benchmarking {db_path}", file=sys.stderr)
+        # A separate process per database keeps caches and connections from leaking between sizes
+        command = [sys.executable, os.path.abspath(__file__), '--db', db_path,
+                   '--repeat', str(args.repeat), '--max-seconds', str(args.max_seconds), '--seed', str(args.seed)]
+        if args.only:
+            command += ['--only', args.only]
+        completed = subprocess.run(command, stdout=subprocess.PIPE, check=True)
+        results.extend(json.loads(completed.stdout)["results"])
+    return results
+
+def git_commit() -> Optional[str]:
+    """Get the current git commit, if the benchmarks run from a checkout."""
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+def compare(results: List[Dict[str, Any]], baseline_path: str):
+    """Print each benchmark's median next to the same benchmark in a previous results file."""
+    with open(baseline_path, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    previous = {(row["employees"], row["benchmark"]): row for row in baseline["results"]}
+    print(f"\n{'Benchmark':<40} {'Employees':>10} {'Before ms':>11} {'After ms':>11} {'Change':>8}", file=sys.stderr)
+    print("-" * 84, file=sys.stderr)
+    for row in results:
+        before = previous.get((row["employees"], row["benchmark"]))
+        if before is None:
+            continue
+        change = (row["median_ms"] / before["median_ms"] - 1) * 100 if before["median_ms"] else 0.0
+        print(f"{row['benchmark']:<40} {row['employees']:>10,} {before['median_ms']:>11.3f} "
+              f"{row['median_ms']:>11.3f} {change:>+7.1f}%", file=sys.stderr)
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the employee data layer and print JSON results")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"Comma-separated database sizes to generate and test, e.g. 10k,100k,1m (default: {DEFAULT_SIZES})")
+    parser.add_argument('--db', help="Benchmark this existing database instead of generated ones")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR,
+                        help=f"Where generated databases are kept and reused (default: {DEFAULT_DATA_DIR})")
+    parser.add_argument('--departments', type=int, default=DEFAULT_DEPARTMENTS,
+                        help=f"Departments in generated databases (default: {DEFAULT_DEPARTMENTS})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED})")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f"Timed runs per benchmark (default: {DEFAULT_REPEAT})")
+    parser.add_argument('--max-seconds', type=float, default=DEFAULT_MAX_SECONDS,
+                        help=f"Time budget per benchmark; at least {MIN_ITERATIONS} runs (default: {DEFAULT_MAX_SECONDS:g})")
+    parser.add_argument('--only', help="Only run benchmarks whose name starts with this, e.g. web. or mcp.get_schema")
+    parser.add_argument('--output', help="Write the JSON results to this file instead of stdout")
+    parser.add_argument('--compare', metavar='BASELINE', help="Compare medians with a previous results file")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    if args.db:
+        if not os.path.exists(args.db):
+            parser.error(f"Database file not found: {args.db}")
+        results = run_database(args.db, args.repeat, args.max_seconds, args.only, args.seed)
+    else:
+        try:
+            sizes = [parse_count(size) for size in args.sizes.split(',') if size.strip()]
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        results = run_sizes(sizes, args)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
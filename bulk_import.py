@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Bulk Employee Import
+Streams employee records from CSV or NDJSON and inserts them in batched transactions.
+"""
+
+import csv
+import json
+import sqlite3
+import time
+from datetime import date
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+
+REQUIRED_FIELDS = ('name', 'department_id', 'salary', 'hire_date')
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_REJECTS = 1000
+
+INSERT_EMPLOYEE_SQL = """
+    INSERT INTO employees (name, department_id, salary, hire_date)
+    VALUES (?, ?, ?, ?)
+"""
+
+UPDATE_EMPLOYEE_SQL = """
+    UPDATE employees
+    SET name = COALESCE(?, name),
+        department_id = COALESCE(?, department_id),
+        salary = COALESCE(?, salary),
+        hire_date = COALESCE(?, hire_date)
+    WHERE id = ?
+"""
+
+def detect_format(filename: str = '', content_type: str = '') -> Optional[str]:
+    """Guess 'csv' or 'ndjson' from a file name or MIME type."""
+    filename = filename.lower()
+    content_type = content_type.lower()
+    if filename.endswith('.csv') or 'csv' in content_type:
+        return 'csv'
+    if filename.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'ndjson'
+    return None
+
+def parse_records(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Parse records lazily, yielding (line number, record, error) tuples.
+    
+    Rows that cannot be parsed are yielded with record None and an error message.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row, None
+    elif fmt == 'ndjson':
+        for line_num, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_num, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_num, None, "Each line must be a JSON object"
+                continue
+            yield line_num, record, None
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+def validate_field(field: str, value: Any, department_ids) -> Any:
+    """Validate and convert one employee field, raising ValueError if it is invalid."""
+    if field == 'name':
+        name = str(value).strip()
+        if not name:
+            raise ValueError("Name cannot be empty")
+        return name
+    if field == 'department_id':
+        try:
+            department_id = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid department ID: {value}")
+        if department_id not in department_ids:
+            raise ValueError(f"Unknown department ID: {department_id}")
+        return department_id
+    if field == 'salary':
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid salary amount: {value}")
+    if field == 'hire_date':
+        hire_date = str(value).strip()
+        try:
+            date.fromisoformat(hire_date)
+        except ValueError:
+            raise ValueError(f"Invalid hire date (expected YYYY-MM-DD): {hire_date}")
+        return hire_date
+    raise ValueError(f"Unknown field: {field}")
+
+def validate_record(record: Dict[str, Any], department_ids) -> tuple:
+    """Validate one record, returning INSERT parameters or raising ValueError."""
+    missing = [field for field in REQUIRED_FIELDS if record.get(field) in (None, '')]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    return tuple(validate_field(field, record[field], department_ids) for field in REQUIRED_FIELDS)
+
+def validate_id(value: Any) -> int:
+    """Parse an employee ID, raising ValueError unless it is a positive integer."""
+    try:
+        employee_id = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid employee ID: {value}")
+    if employee_id < 1:
+        raise ValueError(f"Invalid employee ID: {value}")
+    return employee_id
+
+def validate_changes(record: Dict[str, Any], department_ids) -> tuple:
+    """Validate an update record, returning UPDATE_EMPLOYEE_SQL parameters or raising ValueError.
+    
+    The record needs an id; fields that are missing or empty keep their current value.
+    """
+    employee_id = validate_id(record.get('id'))
+    values = [
+        None if record.get(field) in (None, '') else validate_field(field, record[field], department_ids)
+        for field in REQUIRED_FIELDS
+    ]
+    if all(value is None for value in values):
+        raise ValueError(f"No fields to update for employee {employee_id}")
+    return (*values, employee_id)
+
+def import_employees(conn: sqlite3.Connection, records: Iterable[Tuple[int, Optional[Dict[str, Any]], Optional[str]]],
+                     department_ids, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """Insert parsed records with executemany, committing one transaction per batch.
+    
+    Returns counts, throughput and the per-row rejects (line number and reason).
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    
+    started = time.perf_counter()
+    inserted = 0
+    batches = 0
+    rejected_count = 0
+    rejected = []
+    batch = []
+    
+    def reject(line_num: int, error: str):
+        nonlocal rejected_count
+        rejected_count += 1
+        if len(rejected) < MAX_REPORTED_REJECTS:
+            rejected.append({"line": line_num, "error": error})
+    
+    def flush():
+        nonlocal inserted, batches
+        if not batch:
+            return
+        try:
+            conn.executemany(INSERT_EMPLOYEE_SQL, [params for _, params in batch])
+            conn.commit()
+            inserted += len(batch)
+        except sqlite3.Error as e:
+            conn.rollback()
+            for line_num, _ in batch:
+                reject(line_num, f"Batch failed: {e}")
+        batches += 1
+        batch.clear()
+    
+    for line_num, record, error in records:
+        if error:
+            reject(line_num, error)
+            continue
+        try:
+            batch.append((line_num, validate_record(record, department_ids)))
+        except ValueError as e:
+            reject(line_num, str(e))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    
+    elapsed = time.perf_counter() - started
+    return {
+        "inserted": inserted,
+        "rejected_count": rejected_count,
+        "rejected": rejected,
+        "batches": batches,
+        "batch_size": batch_size,
+        "elapsed_seconds": round(elapsed, 6),
+        "rows_per_second": round(inserted / elapsed, 1) if elapsed > 0 else None,
+    }
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+SQLite Connection Pool
+A small bounded pool of long-lived SQLite connections shared by the web interface.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, Optional
+
+# Pragmas applied to every pooled connection when it is opened
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,        # milliseconds
+    'cache_size': -16000,        # negative = KiB, so ~16 MB of page cache
+    'mmap_size': 134217728,      # 128 MB
+    'temp_store': 'MEMORY',
+}
+
+# Pragmas for mode=ro reader connections (journal_mode needs write access)
+READER_PRAGMAS = {name: value for name, value in DEFAULT_PRAGMAS.items() if name != 'journal_mode'}
+
+def read_only_uri(db_path: str) -> str:
+    """Get a file: URI that opens db_path read-only (connect with uri=True)."""
+    return 'file:' + urllib.parse.quote(os.path.abspath(db_path)) + '?mode=ro'
+
+def open_connection(db_path: str, timeout: float = 10.0, pragmas: Dict[str, Any] = None,
+                    **kwargs) -> sqlite3.Connection:
+    """Open a connection usable from any thread, with Row results and the given pragmas applied."""
+    conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False, **kwargs)
+    conn.row_factory = sqlite3.Row
+    for name, value in (DEFAULT_PRAGMAS if pragmas is None else pragmas).items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+class ConnectionPool:
+    def __init__(self, db_path: str, max_size: int = 8, timeout: float = 10.0,
+                 pragmas: Dict[str, Any] = None,
+                 on_connect: Optional[Callable[[sqlite3.Connection], None]] = None,
+                 read_only: bool = False):
+        """Initialize the pool. Connections are opened lazily up to max_size.
+        
+        on_connect, if given, is called with each new connection (e.g. to install hooks).
+        With read_only, connections are opened through a mode=ro URI and any
+        write fails with sqlite3.OperationalError.
+        """
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.read_only = read_only
+        if pragmas is None:
+            pragmas = READER_PRAGMAS if read_only else DEFAULT_PRAGMAS
+        self.pragmas = dict(pragmas)
+        self.on_connect = on_connect
+
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._closed = False
+        self._watcher = None
+        self._watcher_lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        if self.read_only:
+            conn = open_connection(read_only_uri(self.db_path), self.timeout, self.pragmas, uri=True)
+        else:
+            conn = open_connection(self.db_path, self.timeout, self.pragmas)
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Borrow a connection, opening a new one or waiting if the pool is exhausted."""
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if self._opened < self.max_size:
+                    self._opened += 1
+                    open_new = True
+                else:
+                    open_new = False
+
+            if open_new:
+                try:
+                    conn = self._open()
+                except sqlite3.Error:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            else:
+                started = time.perf_counter()
+                try:
+                    conn = self._idle.get(timeout=self.timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"No database connection available after {self.timeout}s")
+                finally:
+                    with self._lock:
+                        self._waits += 1
+                        self._wait_time += time.perf_counter() - started
+
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+        return conn
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a borrowed connection to the pool."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            self._in_use -= 1
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+            return
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of a with-block."""
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def data_version(self) -> int:
+        """Get PRAGMA data_version from a dedicated watcher connection.
+        
+        The watcher never writes, so the value changes whenever any other
+        connection (pooled or out-of-process) commits to the database.
+        """
+        with self._watcher_lock:
+            if self._watcher is None:
+                self._watcher = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        """Close all idle connections; borrowed ones are closed when released."""
+        self._closed = True
+        with self._watcher_lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get pool counters for monitoring."""
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "size": self._opened,
+                "in_use": self._in_use,
+                "idle": self._opened - self._in_use,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time_seconds": round(self._wait_time, 6),
+            }
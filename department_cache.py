@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Department Cache
+Serves the (rarely changing) departments table from memory, revalidated against a data version.
+"""
+
+import threading
+from typing import Callable, Dict, Any, List, Optional
+
+class DepartmentCache:
+    def __init__(self, load: Callable[[], List[Dict[str, Any]]], version_source: Callable[[], Any]):
+        """Initialize the cache.
+        
+        load reads the departments from the database; version_source returns a
+        cheap value (e.g. PRAGMA data_version) that changes when data may have changed.
+        """
+        self.load = load
+        self.version_source = version_source
+        self._lock = threading.Lock()
+        self._version = None
+        self._departments: Optional[List[Dict[str, Any]]] = None
+        self._names: Dict[int, str] = {}
+        self._ids: frozenset = frozenset()
+        self.loads = 0
+
+    def _current(self):
+        """Reload the departments if the version changed since they were cached.
+        
+        load() runs without holding the lock: it may need to borrow a pooled
+        connection, and callers waiting on the lock may hold the others.
+        """
+        version = self.version_source()
+        with self._lock:
+            if self._departments is not None and version == self._version:
+                return self._departments, self._names, self._ids
+        
+        departments = self.load()
+        names = {dept['id']: dept['name'] for dept in departments}
+        ids = frozenset(names)
+        with self._lock:
+            self._departments = departments
+            self._names = names
+            self._ids = ids
+            self._version = version
+            self.loads += 1
+        return departments, names, ids
+
+    def get_departments(self) -> List[Dict[str, Any]]:
+        """Get all departments (copies, so callers may modify them)."""
+        departments, _, _ = self._current()
+        return [dict(dept) for dept in departments]
+
+    def name_map(self) -> Dict[int, str]:
+        """Get a department id -> name map."""
+        _, names, _ = self._current()
+        return names
+
+    def ids(self) -> frozenset:
+        """Get the set of valid department ids."""
+        _, _, ids = self._current()
+        return ids
+
+    def invalidate(self):
+        """Force a reload on the next access."""
+        with self._lock:
+            self._departments = None
@@ -4,10 +4,32 @@ Employee Management System
 A simple terminal-based CRUD application for managing employee records.
 """
 
+import argparse
+import csv
+import json
 import sqlite3
 import sys
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, TextIO
+
+from department_cache import DepartmentCache
+from migrations import run_migrations
+from employee_search import DEFAULT_SEARCH_LIMIT, search_employees
+from bulk_import import (DEFAULT_BATCH_SIZE, INSERT_EMPLOYEE_SQL, UPDATE_EMPLOYEE_SQL, detect_format,
+                         parse_records, import_employees, validate_changes, validate_id, validate_record)
+
+# Columns written by list/get/export in csv and ndjson format (re-importable)
+EXPORT_FIELDS = ('id', 'name', 'department_id', 'department', 'salary', 'hire_date')
+OUTPUT_FORMATS = ('table', 'csv', 'ndjson')
+
+# Employees shown per screen by the interactive viewer
+VIEW_PAGE_SIZE = 20
+
+EMPLOYEE_ROWS_SQL = """
+    SELECT e.id, e.name, e.department_id, d.name as department, e.salary, e.hire_date
+    FROM employees e
+    LEFT JOIN departments d ON e.department_id = d.id
+"""
 
 class EmployeeManager:
     def __init__(self, db_path: str = "employees.db"):
@@ -16,19 +38,40 @@ class EmployeeManager:
         if not os.path.exists(db_path):
             print(f"❌ Database file not found: {db_path}")
             sys.exit(1)
+        try:
+            run_migrations(db_path)
+        except sqlite3.Error as e:
+            print(f"❌ Error migrating database: {e}")
+            sys.exit(1)
+        self._version_conn = None
+        self.departments = DepartmentCache(self._load_departments, self.data_version)
     
     def get_connection(self):
         """Get a database connection."""
         return sqlite3.connect(self.db_path)
     
-    def get_departments(self) -> List[Dict[str, Any]]:
-        """Get all departments for display."""
+    def data_version(self) -> int:
+        """Get PRAGMA data_version from a long-lived connection that never writes.
+        
+        It changes whenever another connection commits, which makes it a cheap
+        revalidation check for cached data.
+        """
+        if self._version_conn is None:
+            self._version_conn = sqlite3.connect(self.db_path)
+        return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _load_departments(self) -> List[Dict[str, Any]]:
+        """Read all departments from the database."""
         with self.get_connection() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM departments ORDER BY id")
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_departments(self) -> List[Dict[str, Any]]:
+        """Get all departments for display (served from the department cache)."""
+        return self.departments.get_departments()
+    
     def display_departments(self):
         """Display available departments."""
         departments = self.get_departments()
@@ -85,50 +128,144 @@ class EmployeeManager:
         except sqlite3.Error as e:
             print(f"❌ Error creating employee: {e}")
     
+    def count_employees(self) -> int:
+        """Count employees from the department_stats summary table (no table scan)."""
+        with self.get_connection() as conn:
+            return conn.execute("SELECT IFNULL(SUM(employee_count), 0) FROM department_stats").fetchone()[0]
+    
+    def fetch_employee_page(self, after_id: int = 0, before_id: Optional[int] = None,
+                            limit: int = VIEW_PAGE_SIZE) -> List[sqlite3.Row]:
+        """Fetch one page of employees ordered by id with a keyset query.
+        
+        Returns the limit employees after after_id, or with before_id the limit
+        employees just before it. Only the page is read, never the whole table.
+        """
+        with self.get_connection() as conn:
+            conn.row_factory = sqlite3.Row
+            if before_id is not None:
+                rows = conn.execute(EMPLOYEE_ROWS_SQL + " WHERE e.id < ? ORDER BY e.id DESC LIMIT ?",
+                                    (before_id, limit)).fetchall()
+                return rows[::-1]
+            return conn.execute(EMPLOYEE_ROWS_SQL + " WHERE e.id > ? ORDER BY e.id LIMIT ?",
+                                (after_id, limit)).fetchall()
+    
     def view_employees(self):
-        """View all employee records."""
+        """View employee records one page at a time."""
         print("\n👥 EMPLOYEE RECORDS")
         print("=" * 50)
         
         try:
-            with self.get_connection() as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT e.id, e.name, d.name as department, e.salary, e.hire_date
-                    FROM employees e
-                    LEFT JOIN departments d ON e.department_id = d.id
-                    ORDER BY e.id
-                """)
-                employees = cursor.fetchall()
+            total = self.count_employees()
+            page = self.fetch_employee_page()
+            if not page:
+                print("📭 No employees found in the database.")
+                return
+            
+            while True:
+                print()
+                self.write_employees(page)
+                print(f"\n📊 IDs {page[0]['id']}-{page[-1]['id']} of {total} employees")
                 
-                if not employees:
-                    print("📭 No employees found in the database.")
+                command = input("[Enter] next, p = previous, j <id> = jump to ID, q = quit: ").strip().lower()
+                if command in ('q', 'quit'):
                     return
-                
-                print(f"{'ID':<3} {'Name':<20} {'Department':<15} {'Salary':<12} {'Hire Date':<12}")
-                print("-" * 70)
-                
-                for emp in employees:
-                    print(f"{emp['id']:<3} {emp['name']:<20} {emp['department']:<15} ${emp['salary']:<11,.2f} {emp['hire_date']:<12}")
-                
-                print(f"\n📊 Total employees: {len(employees)}")
+                if command in ('', 'n', 'next'):
+                    next_page = self.fetch_employee_page(after_id=page[-1]['id'])
+                    if not next_page:
+                        print("📭 That was the last page.")
+                        return
+                    page = next_page
+                elif command in ('p', 'prev', 'previous'):
+                    previous_page = self.fetch_employee_page(before_id=page[0]['id'])
+                    if previous_page:
+                        page = previous_page
+                    else:
+                        print("⚠️  Already at the first page.")
+                elif command.startswith('j'):
+                    target = command[1:].strip() or input("Jump to employee ID: ").strip()
+                    try:
+                        jump_page = self.fetch_employee_page(after_id=int(target) - 1)
+                    except ValueError:
+                        print("❌ Invalid employee ID!")
+                        continue
+                    if jump_page:
+                        page = jump_page
+                    else:
+                        print(f"📭 No employees with ID {target} or above.")
+                else:
+                    print("❌ Invalid choice!")
                 
         except sqlite3.Error as e:
             print(f"❌ Error viewing employees: {e}")
     
-    def update_employee(self):
-        """Update an existing employee record."""
-        print("\n✏️  UPDATE EMPLOYEE")
-        print("=" * 30)
+    def find_employee_id(self, action: str) -> Optional[int]:
+        """Ask for an employee ID or name prefix and return the chosen employee's ID.
         
-        # First, show current employees
-        self.view_employees()
+        Names are looked up in the full-text index, so only matching employees
+        are shown. Returns None if nothing was chosen.
+        """
+        text = input(f"\nEnter employee ID or name to {action}: ").strip()
+        if not text:
+            print("❌ No employee given!")
+            return None
+        if text.isdigit():
+            return int(text)
         
         try:
-            employee_id = int(input("\nEnter employee ID to update: "))
+            with self.get_connection() as conn:
+                matches = search_employees(conn, text, DEFAULT_SEARCH_LIMIT, column='name')
+        except sqlite3.Error as e:
+            print(f"❌ Error searching employees: {e}")
+            return None
+        
+        if not matches:
+            print(f"❌ No employees named '{text}'!")
+            return None
+        if len(matches) == 1:
+            return matches[0]['id']
+        
+        print()
+        self.write_employees(matches)
+        try:
+            return int(input(f"\nEnter employee ID to {action}: "))
         except ValueError:
             print("❌ Invalid employee ID!")
+            return None
+    
+    def search_employees(self):
+        """Search employees by name or department."""
+        print("\n🔍 SEARCH EMPLOYEES")
+        print("=" * 30)
+        
+        query = input("Enter name or department (prefixes work, e.g. 'ali eng'): ").strip()
+        if not query:
+            print("❌ Search text cannot be empty!")
+            return
+        
+        try:
+            with self.get_connection() as conn:
+                results = search_employees(conn, query, DEFAULT_SEARCH_LIMIT)
+        except sqlite3.Error as e:
+            print(f"❌ Error searching employees: {e}")
+            return
+        
+        if not results:
+            print(f"📭 No employees match '{query}'.")
+            return
+        
+        print(f"\n{'ID':<3} {'Name':<20} {'Department':<15} {'Salary':<12} {'Hire Date':<12}")
+        print("-" * 70)
+        for emp in results:
+            print(f"{emp['id']:<3} {emp['name']:<20} {emp['department'] or '':<15} ${emp['salary'] or 0:<11,.2f} {emp['hire_date'] or '':<12}")
+        print(f"\n📊 Showing {len(results)} best matches")
+    
+    def update_employee(self):
+        """Update an existing employee record."""
+        print("\n✏️  UPDATE EMPLOYEE")
+        print("=" * 30)
+        
+        employee_id = self.find_employee_id("update")
+        if employee_id is None:
             return
         
         # Check if employee exists
@@ -204,13 +341,8 @@ class EmployeeManager:
         print("\n🗑️  DELETE EMPLOYEE")
         print("=" * 30)
         
-        # First, show current employees
-        self.view_employees()
-        
-        try:
-            employee_id = int(input("\nEnter employee ID to delete: "))
-        except ValueError:
-            print("❌ Invalid employee ID!")
+        employee_id = self.find_employee_id("delete")
+        if employee_id is None:
             return
         
         # Check if employee exists
@@ -243,6 +375,215 @@ class EmployeeManager:
         except sqlite3.Error as e:
             print(f"❌ Error deleting employee: {e}")
     
+    def import_employees(self, path: str, fmt: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> bool:
+        """Bulk-import employees from a CSV or NDJSON file ('-' reads stdin)."""
+        fmt = fmt or detect_format(filename=path)
+        if fmt is None:
+            print("❌ Cannot tell the file format; pass --format csv or --format ndjson")
+            return False
+        
+        print(f"\n📥 IMPORTING EMPLOYEES ({fmt.upper()})")
+        print("=" * 30)
+        
+        try:
+            if path == '-':
+                source = sys.stdin
+            else:
+                source = open(path, newline='', encoding='utf-8')
+        except OSError as e:
+            print(f"❌ Cannot open {path}: {e}")
+            return False
+        
+        try:
+            department_ids = self.departments.ids()
+            with self.get_connection() as conn:
+                report = import_employees(conn, parse_records(source, fmt), department_ids, batch_size)
+        except (sqlite3.Error, UnicodeDecodeError) as e:
+            print(f"❌ Error importing employees: {e}")
+            return False
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        
+        print(f"✅ Inserted {report['inserted']} employees in {report['batches']} batches")
+        print(f"   ⏱️  {report['elapsed_seconds']:.2f}s ({report['rows_per_second'] or 0:,.0f} rows/s)")
+        if report['rejected_count']:
+            print(f"   ⚠️  Rejected {report['rejected_count']} rows:")
+            for reject in report['rejected']:
+                print(f"      line {reject['line']}: {reject['error']}")
+            if report['rejected_count'] > len(report['rejected']):
+                print(f"      ... and {report['rejected_count'] - len(report['rejected'])} more")
+        return True
+    
+    def write_employees(self, rows: Iterable[sqlite3.Row], fmt: str = 'table', out: TextIO = None) -> int:
+        """Write employee rows as they are read, returning how many were written."""
+        out = out or sys.stdout
+        count = 0
+        if fmt == 'table':
+            print(f"{'ID':<3} {'Name':<20} {'Department':<15} {'Salary':<12} {'Hire Date':<12}", file=out)
+            print("-" * 70, file=out)
+            for emp in rows:
+                print(f"{emp['id']:<3} {emp['name']:<20} {emp['department'] or '':<15} ${emp['salary'] or 0:<11,.2f} {emp['hire_date'] or '':<12}", file=out)
+                count += 1
+        elif fmt == 'csv':
+            writer = csv.writer(out)
+            writer.writerow(EXPORT_FIELDS)
+            for emp in rows:
+                writer.writerow([emp[field] for field in EXPORT_FIELDS])
+                count += 1
+        elif fmt == 'ndjson':
+            for emp in rows:
+                out.write(json.dumps({field: emp[field] for field in EXPORT_FIELDS}) + "\n")
+                count += 1
+        else:
+            raise ValueError(f"Unsupported output format: {fmt}")
+        return count
+    
+    def list_employees(self, fmt: str = 'table', department_id: Optional[int] = None,
+                       after_id: int = 0, limit: Optional[int] = None, out: TextIO = None) -> bool:
+        """Stream employees ordered by id, optionally filtered by department."""
+        query = EMPLOYEE_ROWS_SQL + " WHERE e.id > ?"
+        params: List[Any] = [after_id]
+        if department_id is not None:
+            query += " AND e.department_id = ?"
+            params.append(department_id)
+        query += " ORDER BY e.id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        
+        try:
+            with self.get_connection() as conn:
+                conn.row_factory = sqlite3.Row
+                # Iterating the cursor fetches rows as they are written, never the whole table
+                count = self.write_employees(conn.execute(query, params), fmt, out)
+        except sqlite3.Error as e:
+            print(f"❌ Error listing employees: {e}", file=sys.stderr)
+            return False
+        if fmt == 'table':
+            print(f"\n📊 Total employees: {count}", file=out or sys.stdout)
+        return True
+    
+    def get_employees(self, ids: List[int], fmt: str = 'table') -> bool:
+        """Print the given employees; returns False if any id does not exist."""
+        try:
+            with self.get_connection() as conn:
+                conn.row_factory = sqlite3.Row
+                rows = {}
+                for employee_id in ids:
+                    row = conn.execute(EMPLOYEE_ROWS_SQL + " WHERE e.id = ?", (employee_id,)).fetchone()
+                    if row is not None:
+                        rows[employee_id] = row
+        except sqlite3.Error as e:
+            print(f"❌ Error reading employees: {e}", file=sys.stderr)
+            return False
+        
+        self.write_employees([rows[employee_id] for employee_id in ids if employee_id in rows], fmt)
+        missing = [employee_id for employee_id in ids if employee_id not in rows]
+        for employee_id in missing:
+            print(f"❌ Employee with ID {employee_id} not found!", file=sys.stderr)
+        return not missing
+    
+    def export_employees(self, fmt: str = 'csv', output: str = '-') -> bool:
+        """Export every employee as CSV or NDJSON to a file ('-' for stdout)."""
+        try:
+            out = sys.stdout if output == '-' else open(output, 'w', newline='', encoding='utf-8')
+        except OSError as e:
+            print(f"❌ Cannot open {output}: {e}", file=sys.stderr)
+            return False
+        try:
+            return self.list_employees(fmt, out=out)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    
+    def _collect(self, records: Iterable, validate) -> tuple:
+        """Validate parsed records, returning (parameters, errors)."""
+        department_ids = self.departments.ids()
+        params = []
+        errors = []
+        for line_num, record, error in records:
+            if error is None:
+                try:
+                    params.append(validate(record, department_ids))
+                    continue
+                except ValueError as e:
+                    error = str(e)
+            # Records given as arguments have no line number
+            errors.append(f"line {line_num}: {error}" if line_num else error)
+        return params, errors
+    
+    @staticmethod
+    def _report_errors(errors: List[str], problem: str = "invalid records") -> bool:
+        """Print the errors that stopped a batch; the batch is not applied if there are any."""
+        print(f"❌ {len(errors)} {problem}, no changes made:", file=sys.stderr)
+        for error in errors[:20]:
+            print(f"   {error}", file=sys.stderr)
+        if len(errors) > 20:
+            print(f"   ... and {len(errors) - 20} more", file=sys.stderr)
+        return False
+    
+    def create_employees(self, records: Iterable) -> bool:
+        """Insert parsed records in one transaction; nothing is written if any record is invalid."""
+        params, errors = self._collect(records, validate_record)
+        if errors:
+            return self._report_errors(errors)
+        try:
+            with self.get_connection() as conn:
+                conn.executemany(INSERT_EMPLOYEE_SQL, params)
+        except sqlite3.Error as e:
+            print(f"❌ Error creating employees: {e}", file=sys.stderr)
+            return False
+        print(f"✅ Created {len(params)} employees")
+        return True
+    
+    def update_employees(self, records: Iterable) -> bool:
+        """Apply parsed updates (each with an id) in one transaction.
+        
+        Fields left out keep their current value. Nothing is written if any
+        record is invalid or names an employee that does not exist.
+        """
+        params, errors = self._collect(records, validate_changes)
+        if errors:
+            return self._report_errors(errors)
+        try:
+            with self.get_connection() as conn:
+                missing = []
+                for values in params:
+                    if conn.execute(UPDATE_EMPLOYEE_SQL, values).rowcount == 0:
+                        missing.append(values[-1])
+                if missing:
+                    conn.rollback()
+        except sqlite3.Error as e:
+            print(f"❌ Error updating employees: {e}", file=sys.stderr)
+            return False
+        if missing:
+            return self._report_errors([f"Employee with ID {employee_id} not found" for employee_id in missing],
+                                       "employees not found")
+        print(f"✅ Updated {len(params)} employees")
+        return True
+    
+    def delete_employees(self, records: Iterable) -> bool:
+        """Delete the employees whose ids are in the parsed records, in one transaction.
+        
+        IDs that do not exist are reported but do not stop the batch.
+        """
+        ids, errors = self._collect(records, lambda record, _: validate_id(record.get('id')))
+        if errors:
+            return self._report_errors(errors)
+        try:
+            with self.get_connection() as conn:
+                deleted = 0
+                for employee_id in ids:
+                    deleted += conn.execute("DELETE FROM employees WHERE id = ?", (employee_id,)).rowcount
+        except sqlite3.Error as e:
+            print(f"❌ Error deleting employees: {e}", file=sys.stderr)
+            return False
+        print(f"✅ Deleted {deleted} employees")
+        if deleted < len(ids):
+            print(f"   ⚠️  {len(ids) - deleted} IDs were not found")
+        return True
+    
     def display_menu(self):
         """Display the main menu."""
         print("\n" + "="*50)
@@ -253,6 +594,7 @@ class EmployeeManager:
         print("3. Update Employee")
         print("4. Delete Employee")
         print("5. Exit")
+        print("6. Search Employees")
         print("="*50)
     
     def run(self):
@@ -263,7 +605,7 @@ class EmployeeManager:
             self.display_menu()
             
             try:
-                choice = input("Enter your choice (1-5): ").strip()
+                choice = input("Enter your choice (1-6): ").strip()
                 
                 if choice == '1':
                     self.create_employee()
@@ -276,8 +618,10 @@ class EmployeeManager:
                 elif choice == '5':
                     print("\n👋 Thank you for using the Employee Management System!")
                     break
+                elif choice == '6':
+                    self.search_employees()
                 else:
-                    print("❌ Invalid choice! Please enter 1-5.")
+                    print("❌ Invalid choice! Please enter 1-6.")
                 
                 input("\nPress Enter to continue...")
                 
@@ -288,15 +632,126 @@ class EmployeeManager:
                 print(f"❌ An error occurred: {e}")
                 input("Press Enter to continue...")
 
-def main():
+COMMANDS = ('list', 'get', 'create', 'update', 'delete', 'import', 'export')
+FIELD_ARGS = ('name', 'department_id', 'salary', 'hire_date')
+
+def add_field_arguments(parser: argparse.ArgumentParser):
+    """Add --name/--department-id/--salary/--hire-date to a subcommand."""
+    parser.add_argument('--name', help="Employee name")
+    parser.add_argument('--department-id', help="Department ID")
+    parser.add_argument('--salary', help="Salary")
+    parser.add_argument('--hire-date', help="Hire date (YYYY-MM-DD)")
+
+def add_input_arguments(parser: argparse.ArgumentParser):
+    """Add --input/--format for subcommands that read records from a file or stdin."""
+    parser.add_argument('--input', metavar='FILE',
+                        help="Read records from FILE ('-' for stdin); used when no values are given as arguments")
+    parser.add_argument('--format', choices=['csv', 'ndjson'],
+                        help="Input format (default: from the file extension, else ndjson)")
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser. With no command the interactive menu runs."""
+    parser = argparse.ArgumentParser(description="Employee Management System")
+    parser.add_argument('--db', default="employees.db", help="Path to the SQLite database")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    list_parser = subparsers.add_parser('list', help="List employees ordered by id")
+    list_parser.add_argument('--department-id', type=int, help="Only this department")
+    list_parser.add_argument('--after-id', type=int, default=0, help="Start after this employee id")
+    list_parser.add_argument('--limit', type=int, help="Most employees to list")
+    list_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='table', help="Output format (default: table)")
+    
+    get_parser = subparsers.add_parser('get', help="Show employees by id")
+    get_parser.add_argument('ids', nargs='+', type=int, help="Employee IDs")
+    get_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='table', help="Output format (default: table)")
+    
+    create_parser = subparsers.add_parser('create', help="Create one employee from arguments, or many from stdin/--input")
+    add_field_arguments(create_parser)
+    add_input_arguments(create_parser)
+    
+    update_parser = subparsers.add_parser('update', help="Update one employee from arguments, or many (records with an id) from stdin/--input")
+    update_parser.add_argument('id', nargs='?', type=int, help="Employee ID")
+    add_field_arguments(update_parser)
+    add_input_arguments(update_parser)
+    
+    delete_parser = subparsers.add_parser('delete', help="Delete employees by id, from arguments or stdin/--input")
+    delete_parser.add_argument('ids', nargs='*', type=int, help="Employee IDs")
+    add_input_arguments(delete_parser)
+    
+    import_parser = subparsers.add_parser('import', help="Bulk-import employees from CSV or NDJSON")
+    import_parser.add_argument('file', help="File to import ('-' for stdin)")
+    import_parser.add_argument('--format', choices=['csv', 'ndjson'], help="Input format (default: from file extension)")
+    import_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                               help=f"Rows per transaction (default: {DEFAULT_BATCH_SIZE})")
+    
+    export_parser = subparsers.add_parser('export', help="Export every employee as CSV or NDJSON")
+    export_parser.add_argument('--output', default='-', help="File to write ('-' for stdout)")
+    export_parser.add_argument('--format', choices=['csv', 'ndjson'], help="Output format (default: from --output extension, else csv)")
+    return parser
+
+def read_records(args) -> Optional[List[tuple]]:
+    """Get (line number, record, error) tuples for a batch subcommand.
+    
+    Values given as arguments make a single record; otherwise records are
+    parsed from --input (stdin by default). Returns None if the input cannot be read.
+    """
+    fields = {field: getattr(args, field, None) for field in FIELD_ARGS}
+    fields = {field: value for field, value in fields.items() if value is not None}
+    if args.command == 'delete' and args.ids:
+        return [(0, {'id': employee_id}, None) for employee_id in args.ids]
+    if args.command == 'update' and args.id is not None:
+        return [(0, dict(fields, id=args.id), None)]
+    if args.command == 'create' and fields:
+        return [(0, fields, None)]
+    
+    path = args.input or '-'
+    fmt = args.format or detect_format(filename=path) or 'ndjson'
+    try:
+        if path == '-':
+            return list(parse_records(sys.stdin, fmt))
+        with open(path, newline='', encoding='utf-8') as source:
+            return list(parse_records(source, fmt))
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"❌ Cannot read {path}: {e}", file=sys.stderr)
+        return None
+
+def main(argv: Optional[List[str]] = None):
     """Main function to start the application."""
-    if len(sys.argv) > 1:
-        db_path = sys.argv[1]
-    else:
-        db_path = "employees.db"
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Keep supporting the original "employee_manager.py <db_path>" form
+    if argv and argv[0] not in COMMANDS and not argv[0].startswith('-'):
+        argv = ['--db', argv[0]] + argv[1:]
+    args = build_parser().parse_args(argv)
+    
+    app = EmployeeManager(args.db)
+    if args.command == 'import':
+        if args.batch_size < 1:
+            print("❌ Batch size must be at least 1")
+            return 1
+        return 0 if app.import_employees(args.file, args.format, args.batch_size) else 1
+    if args.command == 'list':
+        return 0 if app.list_employees(args.format, args.department_id, args.after_id, args.limit) else 1
+    if args.command == 'get':
+        return 0 if app.get_employees(args.ids, args.format) else 1
+    if args.command == 'export':
+        fmt = args.format or detect_format(filename=args.output) or 'csv'
+        return 0 if app.export_employees(fmt, args.output) else 1
+    if args.command in ('create', 'update', 'delete'):
+        records = read_records(args)
+        if records is None:
+            return 1
+        if not records:
+            print("❌ No records given", file=sys.stderr)
+            return 1
+        apply = {
+            'create': app.create_employees,
+            'update': app.update_employees,
+            'delete': app.delete_employees,
+        }[args.command]
+        return 0 if apply(records) else 1
     
-    app = EmployeeManager(db_path)
     app.run()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Employee Search
+Ranked prefix search over employee and department names using the employees_fts FTS5 index.
+"""
+
+import re
+import sqlite3
+from typing import Dict, Any, List, Optional
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+SEARCH_COLUMNS = ('name', 'department')
+
+def build_match_query(text: str, column: Optional[str] = None) -> str:
+    """Turn free text into an FTS5 MATCH expression.
+    
+    Each word becomes a quoted prefix term ("smi"*), so user input can never
+    be interpreted as FTS5 query syntax. All terms must match, in column if given.
+    """
+    if column is not None and column not in SEARCH_COLUMNS:
+        raise ValueError(f"Unknown search column: {column}")
+    terms = re.findall(r'\w+', text, re.UNICODE)
+    match = ' '.join(f'"{term}"*' for term in terms)
+    if match and column is not None:
+        return f"{column} : ({match})"
+    return match
+
+def search_employees(conn: sqlite3.Connection, text: str, limit: int = DEFAULT_SEARCH_LIMIT,
+                     column: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Search employees by name or department name (or only column), best matches (bm25) first."""
+    match = build_match_query(text, column)
+    if not match:
+        return []
+    
+    cursor = conn.cursor()
+    # Rank and limit inside the FTS subquery so only the top hits are joined
+    cursor.execute("""
+        SELECT e.id, e.name, d.name as department, e.salary, e.hire_date, e.department_id
+        FROM (
+            SELECT rowid, rank FROM employees_fts
+            WHERE employees_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ) f
+        JOIN employees e ON e.id = f.rowid
+        LEFT JOIN departments d ON e.department_id = d.id
+        ORDER BY f.rank
+    """, (match, limit))
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Employee Data Access
+The EmployeeManager data layer and query-argument helpers shared by the Flask app and the ASGI read API.
+"""
+
+import base64
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Any, List, Mapping, Optional, Iterator, Callable
+
+from db_pool import ConnectionPool
+from migrations import run_migrations
+from department_cache import DepartmentCache
+from employee_search import DEFAULT_SEARCH_LIMIT, search_employees
+from bulk_import import DEFAULT_BATCH_SIZE, parse_records, import_employees
+from request_metrics import timed_db_call, trace_statements
+
+# Sortable columns for keyset pagination. Nullable columns are coalesced so the
+# (sort value, id) keyset comparison never drops rows with missing values; the
+# coalesced expressions have matching expression indexes (migration 4).
+SORT_COLUMNS = {
+    'id': 'e.id',
+    'name': 'e.name',
+    'salary': 'COALESCE(e.salary, 0)',
+    'hire_date': "COALESCE(e.hire_date, '')",
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 1000
+
+def encode_cursor(sort: str, order: str, value: Any, employee_id: int) -> str:
+    """Encode a keyset position as an opaque URL-safe cursor."""
+    payload = json.dumps([sort, order, value, employee_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor: str, sort: str, order: str) -> tuple:
+    """Decode a cursor produced by encode_cursor, checking it matches the sort."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, employee_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if (not isinstance(employee_id, int) or isinstance(employee_id, bool)
+            or not isinstance(value, (str, int, float, type(None))) or isinstance(value, bool)):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort or cursor_order != order:
+        raise ValueError("Cursor does not match the requested sort order")
+    return value, employee_id
+
+class EmployeeManager:
+    def __init__(self, db_path: str = "employees.db", pool_size: int = 8, read_only: bool = False):
+        """Initialize the Employee Manager with database path.
+        
+        With read_only, pooled connections are opened mode=ro and only the
+        read methods can be used.
+        """
+        self.db_path = db_path
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Database file not found: {db_path}")
+        # Statements are counted per request for the /metrics endpoint
+        self.pool = ConnectionPool(db_path, max_size=pool_size, on_connect=trace_statements,
+                                   read_only=read_only)
+        self.write_listeners: List[Callable[[], None]] = []
+        self.departments = DepartmentCache(self._load_departments, self.pool.data_version)
+        run_migrations(db_path)
+    
+    def notify_write(self):
+        """Tell registered listeners (caches) that employee data changed."""
+        for listener in self.write_listeners:
+            listener()
+    
+    @timed_db_call
+    def get_dashboard_stats(self) -> Dict[str, Any]:
+        """Get dashboard statistics from the summary tables in O(departments)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT department_id, employee_count, salary_sum
+                FROM department_stats
+                WHERE employee_count > 0
+            """)
+            rows = cursor.fetchall()
+            cursor.execute("""
+                SELECT IFNULL(SUM(employee_count), 0)
+                FROM department_hire_stats
+                WHERE hire_year = ?
+            """, (str(datetime.now().year),))
+            new_this_year = cursor.fetchone()[0]
+        
+        total_employees = sum(row['employee_count'] for row in rows)
+        total_salary = sum(row['salary_sum'] for row in rows)
+        return {
+            "total_employees": total_employees,
+            "avg_salary": total_salary / total_employees if total_employees else 0,
+            "new_this_year": new_this_year,
+            "department_counts": {
+                (row['department_id'] or None): row['employee_count'] for row in rows
+            },
+        }
+    
+    def get_connection(self):
+        """Borrow a pooled database connection (use as a context manager)."""
+        return self.pool.connection()
+    
+    def _load_departments(self) -> List[Dict[str, Any]]:
+        """Read all departments from the database."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM departments ORDER BY id")
+            return [dict(row) for row in cursor.fetchall()]
+    
+    @timed_db_call
+    def get_departments(self) -> List[Dict[str, Any]]:
+        """Get all departments for display (served from the department cache)."""
+        return self.departments.get_departments()
+    
+    def _employee_dict(self, row: sqlite3.Row, names: Dict[int, str]) -> Dict[str, Any]:
+        """Build an employee dict, resolving the department name from the cache."""
+        return {
+            "id": row['id'],
+            "name": row['name'],
+            "department": names.get(row['department_id']),
+            "salary": row['salary'],
+            "hire_date": row['hire_date'],
+            "department_id": row['department_id'],
+        }
+    
+    @timed_db_call
+    def get_employees(self) -> List[Dict[str, Any]]:
+        """Get all employees with department information."""
+        names = self.departments.name_map()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, name, salary, hire_date, department_id
+                FROM employees
+                ORDER BY id
+            """)
+            return [self._employee_dict(row, names) for row in cursor.fetchall()]
+    
+    def iter_employees(self, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """Yield all employees one at a time, reading batch_size rows per keyset query.
+        
+        A pooled connection is borrowed only while each batch is read, so slow
+        stream consumers never hold one.
+        """
+        names = self.departments.name_map()
+        last_id = 0
+        while True:
+            with self.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT id, name, salary, hire_date, department_id
+                    FROM employees
+                    WHERE id > ?
+                    ORDER BY id
+                    LIMIT ?
+                """, (last_id, batch_size)).fetchall()
+            for row in rows:
+                yield self._employee_dict(row, names)
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1]['id']
+    
+    @timed_db_call
+    def get_employees_page(self, limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None,
+                           department_id: Optional[int] = None, min_salary: Optional[float] = None,
+                           max_salary: Optional[float] = None, sort: str = 'id',
+                           order: str = 'asc', before: Optional[str] = None) -> Dict[str, Any]:
+        """Get one page of employees using keyset pagination on (sort column, id).
+        
+        after gives the page following a next_cursor; before gives the page
+        preceding a prev_cursor.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Invalid sort column: {sort}")
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"Invalid sort order: {order}")
+        if after and before:
+            raise ValueError("Pass either after or before, not both")
+        
+        sort_expr = SORT_COLUMNS[sort]
+        conditions = []
+        params: List[Any] = []
+        
+        if department_id is not None:
+            conditions.append("e.department_id = ?")
+            params.append(department_id)
+        if min_salary is not None:
+            conditions.append("e.salary >= ?")
+            params.append(min_salary)
+        if max_salary is not None:
+            conditions.append("e.salary <= ?")
+            params.append(max_salary)
+        # A previous page is read backwards from the cursor, then flipped
+        backwards = bool(before)
+        scan_order = order if not backwards else ('desc' if order == 'asc' else 'asc')
+        cursor_value = after or before
+        if cursor_value:
+            value, last_id = decode_cursor(cursor_value, sort, order)
+            comparison = '>' if scan_order == 'asc' else '<'
+            if sort == 'id':
+                conditions.append(f"e.id {comparison} ?")
+                params.append(last_id)
+            else:
+                # The single-column bound lets SQLite seek the sort index;
+                # the row value alone would scan it from the start
+                conditions.append(f"{sort_expr} {comparison}= ? AND ({sort_expr}, e.id) {comparison} (?, ?)")
+                params.extend([value, value, last_id])
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        direction = scan_order.upper()
+        order_by = "e.id" if sort == 'id' else f"{sort_expr} {direction}, e.id"
+        
+        names = self.departments.name_map()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # Fetch one extra row to learn whether another page exists
+            cursor.execute(f"""
+                SELECT e.id, e.name, e.salary, e.hire_date, e.department_id,
+                       {sort_expr} as sort_key
+                FROM employees e
+                {where}
+                ORDER BY {order_by} {direction}
+                LIMIT ?
+            """, params + [limit + 1])
+            rows = cursor.fetchall()
+        
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+        # Coming from a cursor means there are rows on that side of the page
+        has_next = more if not backwards else True
+        has_prev = more if backwards else bool(after)
+        
+        next_cursor = prev_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(sort, order, rows[-1]['sort_key'], rows[-1]['id'])
+        if rows and has_prev:
+            prev_cursor = encode_cursor(sort, order, rows[0]['sort_key'], rows[0]['id'])
+        
+        return {
+            "employees": [self._employee_dict(row, names) for row in rows],
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "limit": limit,
+        }
+    
+    @timed_db_call
+    def search_employees(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Dict[str, Any]]:
+        """Full-text search on employee and department names (prefix match, ranked)."""
+        with self.get_connection() as conn:
+            return search_employees(conn, query, limit)
+    
+    @timed_db_call
+    def get_employee(self, employee_id: int) -> Optional[Dict[str, Any]]:
+        """Get a specific employee by ID."""
+        names = self.departments.name_map()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, name, salary, hire_date, department_id
+                FROM employees
+                WHERE id = ?
+            """, (employee_id,))
+            result = cursor.fetchone()
+            return self._employee_dict(result, names) if result else None
+    
+    @timed_db_call
+    def create_employee(self, name: str, department_id: int, salary: float, hire_date: str) -> bool:
+        """Create a new employee record."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO employees (name, department_id, salary, hire_date) 
+                    VALUES (?, ?, ?, ?)
+                """, (name, department_id, salary, hire_date))
+                conn.commit()
+            self.notify_write()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    @timed_db_call
+    def bulk_import(self, lines, fmt: str, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """Import employees from CSV or NDJSON lines in batched transactions."""
+        # Read the ids first: refreshing the department cache borrows a connection of its own
+        department_ids = self.departments.ids()
+        with self.get_connection() as conn:
+            report = import_employees(conn, parse_records(lines, fmt), department_ids, batch_size)
+        if report['inserted']:
+            self.notify_write()
+        return report
+    
+    @timed_db_call
+    def update_employee(self, employee_id: int, name: str, department_id: int, salary: float, hire_date: str) -> bool:
+        """Update an existing employee record."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE employees 
+                    SET name = ?, department_id = ?, salary = ?, hire_date = ?
+                    WHERE id = ?
+                """, (name, department_id, salary, hire_date, employee_id))
+                conn.commit()
+            self.notify_write()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    @timed_db_call
+    def delete_employee(self, employee_id: int) -> bool:
+        """Delete an employee record."""
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM employees WHERE id = ?", (employee_id,))
+                conn.commit()
+            self.notify_write()
+            return True
+        except sqlite3.Error:
+            return False
+
+def parse_page_args(args: Mapping[str, str]) -> Dict[str, Any]:
+    """Read get_employees_page arguments from query args, raising ValueError if any are invalid."""
+    limit = optional_arg(args, 'limit', int)
+    if limit is None:
+        limit = DEFAULT_PAGE_SIZE
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return {
+        "limit": limit,
+        "after": args.get('after') or None,
+        "before": args.get('before') or None,
+        "department_id": optional_arg(args, 'department_id', int),
+        "min_salary": optional_arg(args, 'min_salary', float),
+        "max_salary": optional_arg(args, 'max_salary', float),
+        "sort": args.get('sort', 'id'),
+        "order": args.get('order', 'asc').lower(),
+    }
+
+def stats_payload(stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape get_dashboard_stats() for JSON, where object keys must be strings."""
+    return dict(stats, department_counts={
+        ('none' if department_id is None else str(department_id)): count
+        for department_id, count in stats['department_counts'].items()
+    })
+
+def optional_arg(args: Mapping[str, str], name: str, convert):
+    """Read an optional query argument, raising ValueError if it does not convert."""
+    value = args.get(name, '').strip()
+    if not value:
+        return None
+    try:
+        return convert(value)
+    except ValueError:
+        raise ValueError(f"Invalid value for {name}: {value}")
@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Local Load Generator
+Drives the Flask app over HTTP and the MCP server over pipelined stdio JSON-RPC,
+reporting throughput, latency percentiles, histograms and error rates.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from datetime import date, timedelta
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_DB = os.path.join(HERE, 'employees.db')
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_DURATION = 10.0
+DEFAULT_WRITE_RATIO = 0.1
+DEFAULT_PIPELINE_DEPTH = 16
+DEFAULT_SEED = 42
+STARTUP_TIMEOUT = 30.0
+REQUEST_TIMEOUT = 60.0
+MAX_SAMPLED_IDS = 10000
+# simple_mcp_server.py evicts the least recently used cursor beyond this many
+MCP_MAX_OPEN_CURSORS = 16
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = [0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# Relative weights of operations within the read and the write share of the mix
+DEFAULT_WEB_MIX = 'index=1,api_page=6,api_filtered=2,edit_form=1,create=2,update=2,delete=1'
+DEFAULT_MCP_MIX = 'point_lookup=6,page=2,aggregate=1,search=2,get_schema=1,insert=1'
+WEB_WRITES = {'create', 'update', 'delete'}
+MCP_WRITES = {'insert'}
+
+class LatencyRecorder:
+    def __init__(self):
+        """Collect per-operation latencies and errors from many threads."""
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = {}
+        self._errors: Dict[str, int] = {}
+        self._error_examples: Dict[str, str] = {}
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, operation: str, seconds: float, error: Optional[str] = None):
+        """Record one completed request."""
+        with self._lock:
+            self._samples.setdefault(operation, []).append(seconds * 1000)
+            if error is not None:
+                self._errors[operation] = self._errors.get(operation, 0) + 1
+                self._error_examples.setdefault(operation, error)
+
+    def stop(self):
+        """Mark the end of the run, for requests-per-second figures."""
+        self.finished = time.perf_counter()
+
+    def summary(self) -> Dict[str, Any]:
+        """Get totals, throughput, percentiles and histograms, overall and per operation."""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        with self._lock:
+            operations = {
+                name: summarize(samples, self._errors.get(name, 0), elapsed, self._error_examples.get(name))
+                for name, samples in sorted(self._samples.items())
+            }
+            all_samples = [sample for samples in self._samples.values() for sample in samples]
+            overall = summarize(all_samples, sum(self._errors.values()), elapsed)
+        return {"elapsed_seconds": round(elapsed, 3), "overall": overall, "operations": operations}
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))]
+
+def summarize(samples: List[float], errors: int, elapsed: float, error_example: Optional[str] = None) -> Dict[str, Any]:
+    """Summarize latency samples (ms) for one operation or the whole run."""
+    ordered = sorted(samples)
+    histogram = []
+    index = 0
+    for bound in HISTOGRAM_BUCKETS_MS + [None]:
+        count = 0
+        while index < len(ordered) and (bound is None or ordered[index] <= bound):
+            count += 1
+            index += 1
+        histogram.append({"le_ms": bound, "count": count})
+    result = {
+        "requests": len(ordered),
+        "errors": errors,
+        "error_rate": round(errors / len(ordered), 4) if ordered else 0.0,
+        "requests_per_second": round(len(ordered) / elapsed, 2) if elapsed > 0 else None,
+        "p50_ms": round(percentile(ordered, 0.50), 3),
+        "p90_ms": round(percentile(ordered, 0.90), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+        "histogram": histogram,
+    }
+    if error_example:
+        result["first_error"] = error_example
+    return result
+
+def parse_mix(text: str, known: List[str]) -> Dict[str, float]:
+    """Parse 'name=weight,...' into a weight per operation."""
+    mix = {}
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in known:
+            raise argparse.ArgumentTypeError(f"Unknown operation '{name}' (choose from {', '.join(known)})")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid weight for {name}: {weight}")
+    return mix
+
+class OperationPicker:
+    def __init__(self, mix: Dict[str, float], writes: set, write_ratio: float):
+        """Choose operations so that write_ratio of them are writes, weighted within each group."""
+        self.reads = [(name, weight) for name, weight in mix.items() if name not in writes and weight > 0]
+        self.writes = [(name, weight) for name, weight in mix.items() if name in writes and weight > 0]
+        self.write_ratio = write_ratio if self.reads else 1.0
+        if not self.writes:
+            self.write_ratio = 0.0
+        if not self.reads and not self.writes:
+            raise ValueError("The operation mix is empty")
+
+    def pick(self, rng: random.Random) -> str:
+        """Pick the next operation."""
+        group = self.writes if rng.random() < self.write_ratio else self.reads
+        return rng.choices([name for name, _ in group], [weight for _, weight in group])[0]
+
+def random_employee_fields(rng: random.Random, department_ids: List[int]) -> Dict[str, Any]:
+    """Random but valid employee form fields."""
+    return {
+        "name": f"Load Test {rng.randrange(1_000_000)}",
+        "department_id": rng.choice(department_ids),
+        "salary": rng.randrange(40_000, 150_000, 100),
+        "hire_date": (date(2015, 1, 1) + timedelta(days=rng.randrange(3650))).isoformat(),
+    }
+
+def free_port() -> int:
+    """Find a free localhost TCP port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def run_workers(concurrency: int, duration: float, max_requests: Optional[int],
+                work: Callable[[random.Random], None], seed: int):
+    """Run work in concurrency threads until the duration or request count is used up."""
+    deadline = time.perf_counter() + duration
+    remaining = [max_requests]
+    lock = threading.Lock()
+
+    def take() -> bool:
+        if time.perf_counter() >= deadline:
+            return False
+        if remaining[0] is None:
+            return True
+        with lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(worker_seed: int):
+        rng = random.Random(worker_seed)
+        while take():
+            work(rng)
+
+    threads = [threading.Thread(target=worker, args=(seed + index,), daemon=True) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+# ---------------------------------------------------------------- Flask app
+
+class WebClient:
+    def __init__(self, host: str, port: int):
+        """A keep-alive HTTP client; each worker thread gets its own."""
+        self.host = host
+        self.port = port
+        self.conn = None
+
+    def request(self, method: str, path: str, form: Optional[Dict[str, Any]] = None) -> Tuple[int, bytes]:
+        """Send a request, reconnecting once if the kept-alive connection was closed."""
+        body = urllib.parse.urlencode(form) if form is not None else None
+        headers = {"Content-Type": "application/x-www-form-urlencoded"} if form is not None else {}
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=REQUEST_TIMEOUT)
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                self.conn.close()
+                self.conn = None
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+
+def start_web_app(db_path: str, port: int) -> subprocess.Popen:
+    """Start app.py on localhost with a threaded server (no debugger or reloader)."""
+    env = dict(os.environ, EMPLOYEE_DB=os.path.abspath(db_path))
+    code = f"import app; app.app.run(host='127.0.0.1', port={port}, threaded=True, debug=False)"
+    return subprocess.Popen([sys.executable, '-c', code], cwd=HERE, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def wait_for_web(host: str, port: int, process: Optional[subprocess.Popen]):
+    """Wait until the app answers, or fail if it exits or takes too long."""
+    deadline = time.perf_counter() + STARTUP_TIMEOUT
+    while time.perf_counter() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"The web app exited with status {process.returncode}")
+        try:
+            status, _ = WebClient(host, port).request('GET', '/api/pool')
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"The web app did not start on {host}:{port} within {STARTUP_TIMEOUT:g}s")
+
+def sample_web_ids(client: WebClient) -> Tuple[List[int], List[int]]:
+    """Collect employee ids and department ids through the paginated API."""
+    employee_ids, department_ids = [], set()
+    after = None
+    while len(employee_ids) < MAX_SAMPLED_IDS:
+        path = '/api/employees?limit=500' + (f'&after={urllib.parse.quote(after)}' if after else '')
+        status, body = client.request('GET', path)
+        if status != 200:
+            raise RuntimeError(f"GET {path} returned {status}")
+        page = json.loads(body)
+        for employee in page['employees']:
+            employee_ids.append(employee['id'])
+            if employee.get('department_id') is not None:
+                department_ids.add(employee['department_id'])
+        after = page.get('next_cursor')
+        if not after:
+            break
+    return employee_ids, sorted(department_ids)
+
+def web_operation(name: str, client: WebClient, rng: random.Random,
+                  employee_ids: List[int], department_ids: List[int]) -> Optional[str]:
+    """Run one web operation, returning an error description or None."""
+    employee_id = rng.choice(employee_ids) if employee_ids else 1
+    if name == 'index':
+        status, _ = client.request('GET', '/')
+    elif name == 'api_page':
+        status, _ = client.request('GET', '/api/employees?limit=50')
+    elif name == 'api_filtered':
+        department_id = rng.choice(department_ids) if department_ids else 1
+        status, _ = client.request('GET', f'/api/employees?limit=50&department_id={department_id}&sort=salary&order=desc')
+    elif name == 'edit_form':
+        status, _ = client.request('GET', f'/edit/{employee_id}')
+    elif name == 'create':
+        status, _ = client.request('POST', '/create', random_employee_fields(rng, department_ids or [1]))
+        # A successful create redirects; re-rendering the form (200) means it failed
+        if status == 200:
+            return "create re-rendered the form"
+    elif name == 'update':
+        status, _ = client.request('POST', f'/edit/{employee_id}', random_employee_fields(rng, department_ids or [1]))
+        if status == 200:
+            return "update re-rendered the form"
+    elif name == 'delete':
+        status, _ = client.request('POST', f'/delete/{employee_id}')
+    else:
+        raise ValueError(f"Unknown operation: {name}")
+    if status >= 400:
+        return f"HTTP {status}"
+    return None
+
+def run_web(args) -> Dict[str, Any]:
+    """Load-test the Flask app."""
+    process = None
+    if args.url:
+        parsed = urllib.parse.urlparse(args.url)
+        host, port = parsed.hostname or '127.0.0.1', parsed.port or 80
+    else:
+        host, port = '127.0.0.1', free_port()
+        process = start_web_app(args.db, port)
+    try:
+        wait_for_web(host, port, process)
+        employee_ids, department_ids = sample_web_ids(WebClient(host, port))
+        picker = OperationPicker(args.mix, WEB_WRITES, args.write_ratio)
+        recorder = LatencyRecorder()
+        local = threading.local()
+
+        def work(rng: random.Random):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = WebClient(host, port)
+            name = picker.pick(rng)
+            started = time.perf_counter()
+            try:
+                error = web_operation(name, client, rng, employee_ids, department_ids)
+            except (OSError, http.client.HTTPException) as e:
+                error = f"{type(e).__name__}: {e}"
+            recorder.record(name, time.perf_counter() - started, error)
+
+        run_workers(args.concurrency, args.duration, args.requests, work, args.seed)
+        recorder.stop()
+        return recorder.summary()
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+# ---------------------------------------------------------------- MCP server
+
+MCP_AGGREGATE_SQL = """
+    SELECT d.name, COUNT(*) AS employees, AVG(e.salary) AS avg_salary
+    FROM employees e JOIN departments d ON d.id = e.department_id
+    GROUP BY d.id
+"""
+
+def mcp_call(name: str, rng: random.Random, max_id: int) -> Tuple[str, Dict[str, Any]]:
+    """Build the tools/call (tool name, arguments) for one MCP operation."""
+    if name == 'point_lookup':
+        return 'query_database', {"query": "SELECT * FROM employees WHERE id = ?", "params": [rng.randint(1, max_id)]}
+    if name == 'page':
+        return 'query_database', {"query": "SELECT * FROM employees WHERE id > ? ORDER BY id",
+                                  "params": [rng.randint(0, max_id)], "limit": 100}
+    if name == 'aggregate':
+        return 'query_database', {"query": MCP_AGGREGATE_SQL}
+    if name == 'search':
+        return 'search_employees', {"query": rng.choice(['ali', 'smi', 'eng', 'bob j', 'sales'])}
+    if name == 'get_schema':
+        return 'get_schema', {}
+    if name == 'insert':
+        return 'insert_employees', {"records": [random_employee_fields(rng, [1])]}
+    raise ValueError(f"Unknown operation: {name}")
+
+def mcp_error(response: Dict[str, Any]) -> Optional[str]:
+    """Get the error from a JSON-RPC response or from the tool result inside it."""
+    if "error" in response:
+        return response["error"].get("message", "JSON-RPC error")
+    try:
+        result = json.loads(response["result"]["content"][0]["text"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+    if isinstance(result, dict) and "error" in result:
+        return str(result["error"])
+    return None
+
+def mcp_cursor_id(response: Dict[str, Any]) -> Optional[str]:
+    """Get the cursor_id a query_database response left open, if any."""
+    try:
+        result = json.loads(response["result"]["content"][0]["text"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+    return result.get("cursor_id") if isinstance(result, dict) else None
+
+def run_mcp(args) -> Dict[str, Any]:
+    """Load-test simple_mcp_server.py over stdio with up to --pipeline-depth requests in flight."""
+    with sqlite3.connect(args.db) as conn:
+        max_id = conn.execute("SELECT IFNULL(MAX(id), 1) FROM employees").fetchone()[0]
+
+    command = [sys.executable, os.path.join(HERE, 'simple_mcp_server.py'), args.db] + args.server_arg
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, text=True, bufsize=1)
+    picker = OperationPicker(args.mix, MCP_WRITES, args.write_ratio)
+    rng = random.Random(args.seed)
+    in_flight = threading.Semaphore(args.pipeline_depth)
+    pending: Dict[Any, Tuple[str, float]] = {}
+    pending_lock = threading.Lock()
+    write_lock = threading.Lock()
+    close_ids = itertools.count(1)
+    # Pages whose cursor may still be open; kept below the server's limit so
+    # none is evicted before its close_cursor arrives
+    cursor_slots = threading.Semaphore(MCP_MAX_OPEN_CURSORS)
+    initialized = threading.Event()
+    recorder = LatencyRecorder()
+
+    def write_request(request_id: Any, name: str, method: str, params: Dict[str, Any]):
+        with pending_lock:
+            pending[request_id] = (name, time.perf_counter())
+        with write_lock:
+            process.stdin.write(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}) + "\n")
+            process.stdin.flush()
+
+    def read_responses():
+        for line in process.stdout:
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            with pending_lock:
+                sent = pending.pop(response.get("id"), None)
+            if sent is None:
+                continue
+            name, started = sent
+            if name == 'initialize':
+                initialized.set()
+                in_flight.release()
+            elif name == 'close_cursor':
+                recorder.record(name, time.perf_counter() - started, mcp_error(response))
+                cursor_slots.release()
+            else:
+                recorder.record(name, time.perf_counter() - started, mcp_error(response))
+                in_flight.release()
+                if name != 'page':
+                    continue
+                # A page reads only the first page, so release its cursor (and
+                # connection) right away instead of leaving it to the idle expiry
+                cursor_id = mcp_cursor_id(response)
+                try:
+                    if cursor_id:
+                        write_request(f"close-{next(close_ids)}", 'close_cursor', 'tools/call',
+                                      {"name": "close_cursor", "arguments": {"cursor_id": cursor_id}})
+                        continue
+                except (OSError, ValueError):
+                    pass  # The run is over and the server closes its cursors on exit
+                cursor_slots.release()
+        # The server exited: unblock the sender
+        initialized.set()
+        for _ in range(args.pipeline_depth):
+            in_flight.release()
+        for _ in range(MCP_MAX_OPEN_CURSORS):
+            cursor_slots.release()
+
+    reader = threading.Thread(target=read_responses, daemon=True)
+    reader.start()
+    try:
+        def send(request_id: int, name: str, method: str, params: Dict[str, Any]):
+            in_flight.acquire()
+            write_request(request_id, name, method, params)
+
+        send(0, 'initialize', 'initialize', {})
+        initialized.wait(STARTUP_TIMEOUT)
+        recorder.started = time.perf_counter()
+        deadline = time.perf_counter() + args.duration
+        request_id = 0
+        while time.perf_counter() < deadline and (args.requests is None or request_id < args.requests):
+            if process.poll() is not None:
+                raise RuntimeError(f"The MCP server exited with status {process.returncode}")
+            request_id += 1
+            name = picker.pick(rng)
+            tool, arguments = mcp_call(name, rng, max_id)
+            if name == 'page':
+                cursor_slots.acquire()
+            send(request_id, name, 'tools/call', {"name": tool, "arguments": arguments})
+        # Wait for the responses still in flight
+        for _ in range(args.pipeline_depth):
+            in_flight.acquire()
+        recorder.stop()
+        return recorder.summary()
+    finally:
+        with write_lock:
+            process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+# ---------------------------------------------------------------- Reporting
+
+def print_report(title: str, summary: Dict[str, Any]):
+    """Print a human-readable report to stderr."""
+    out = sys.stderr
+    overall = summary["overall"]
+    print(f"\n📊 {title}: {overall['requests']} requests in {summary['elapsed_seconds']:.1f}s "
+          f"({overall['requests_per_second']} req/s), {overall['errors']} errors ({overall['error_rate']:.2%})", file=out)
+    print(f"\n{'Operation':<16} {'Requests':>9} {'Errors':>7} {'Req/s':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'Max ms':>9}", file=out)
+    print("-" * 84, file=out)
+    for name, row in list(summary["operations"].items()) + [("ALL", overall)]:
+        print(f"{name:<16} {row['requests']:>9} {row['errors']:>7} {row['requests_per_second'] or 0:>9.1f} "
+              f"{row['p50_ms']:>9.2f} {row['p90_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}", file=out)
+    for name, row in summary["operations"].items():
+        if row.get("first_error"):
+            print(f"   ⚠️  {name}: {row['first_error']}", file=out)
+
+    print("\nLatency histogram (all requests):", file=out)
+    peak = max((bucket["count"] for bucket in overall["histogram"]), default=0) or 1
+    for bucket in overall["histogram"]:
+        label = f"<= {bucket['le_ms']:g} ms" if bucket["le_ms"] is not None else f"> {HISTOGRAM_BUCKETS_MS[-1]:g} ms"
+        bar = '█' * int(40 * bucket["count"] / peak)
+        print(f"  {label:>12} {bucket['count']:>8} {bar}", file=out)
+
+def copy_database(source: str, destination: str) -> str:
+    """Copy a database with the backup API (consistent even while it is in use) and return the copy's path."""
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(destination)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+    return destination
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Load-test the web app or the MCP server on localhost")
+    subparsers = parser.add_subparsers(dest='target', required=True)
+
+    def add_common(subparser, default_mix: str, known: List[str]):
+        subparser.add_argument('--duration', type=float, default=DEFAULT_DURATION,
+                               help=f"Seconds to run (default: {DEFAULT_DURATION:g})")
+        subparser.add_argument('--requests', type=int, help="Stop after this many requests")
+        subparser.add_argument('--write-ratio', type=float, default=DEFAULT_WRITE_RATIO,
+                               help=f"Fraction of requests that write (default: {DEFAULT_WRITE_RATIO})")
+        subparser.add_argument('--mix', default=default_mix, type=lambda text: parse_mix(text, known),
+                               help=f"Operation weights within reads and writes (default: {default_mix})")
+        subparser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED})")
+        subparser.add_argument('--json', metavar='FILE', help="Also write the results as JSON to FILE")
+
+    web_parser = subparsers.add_parser('web', help="Drive the Flask app over HTTP")
+    target = web_parser.add_mutually_exclusive_group()
+    target.add_argument('--db',
+                        help="Start app.py on a free localhost port serving this database, which the writes modify "
+                             "(default: a temporary copy of employees.db)")
+    target.add_argument('--url', help="Use an already running app instead, e.g. http://127.0.0.1:5000")
+    web_parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                            help=f"Concurrent clients (default: {DEFAULT_CONCURRENCY})")
+    add_common(web_parser, DEFAULT_WEB_MIX, ['index', 'api_page', 'api_filtered', 'edit_form', 'create', 'update', 'delete'])
+
+    mcp_parser = subparsers.add_parser('mcp', help="Spawn simple_mcp_server.py and pipeline JSON-RPC calls")
+    mcp_parser.add_argument('--db', help="Database for the server, which the writes modify "
+                                         "(default: a temporary copy of employees.db)")
+    mcp_parser.add_argument('--pipeline-depth', type=int, default=DEFAULT_PIPELINE_DEPTH,
+                            help=f"Requests in flight at once (default: {DEFAULT_PIPELINE_DEPTH})")
+    mcp_parser.add_argument('--server-arg', action='append', default=[],
+                            help="Extra server option, repeatable, e.g. --server-arg=--concurrent")
+    add_common(mcp_parser, DEFAULT_MCP_MIX, ['point_lookup', 'page', 'aggregate', 'search', 'get_schema', 'insert'])
+
+    args = parser.parse_args(argv)
+    if not 0 <= args.write_ratio <= 1:
+        parser.error("--write-ratio must be between 0 and 1")
+    if args.target == 'web' and args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.target == 'mcp' and args.pipeline_depth < 1:
+        parser.error("--pipeline-depth must be at least 1")
+    uses_db = args.target == 'mcp' or not args.url
+    if uses_db and args.db and not os.path.exists(args.db):
+        parser.error(f"Database file not found: {args.db}")
+
+    with tempfile.TemporaryDirectory(prefix='loadtest-') as scratch:
+        # Writes must never touch the sample database unless it is asked for by name
+        if uses_db and not args.db:
+            args.db = copy_database(SAMPLE_DB, os.path.join(scratch, 'employees.db'))
+            print(f"📋 Using a temporary copy of {os.path.relpath(SAMPLE_DB)}", file=sys.stderr)
+        try:
+            if args.target == 'web':
+                summary = run_web(args)
+                title = f"Web app ({args.concurrency} clients)"
+            else:
+                summary = run_mcp(args)
+                title = f"MCP server (pipeline depth {args.pipeline_depth})"
+        except (RuntimeError, ValueError, OSError, sqlite3.Error) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+
+    print_report(title, summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as json_file:
+            json.dump(dict(summary, target=args.target), json_file, indent=2)
+    return 1 if summary["overall"]["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Schema Migrations
+Versioned schema changes shared by the web app, the CLI and the MCP server.
+The applied version is tracked in PRAGMA user_version.
+"""
+
+import sqlite3
+from typing import List, Tuple
+
+# Summary tables kept current by triggers so dashboard statistics never scan
+# employees. Employees without a department are counted under department_id 0.
+DEPARTMENT_STATS_SQL = """
+CREATE TABLE IF NOT EXISTS department_stats (
+    department_id INTEGER PRIMARY KEY,
+    employee_count INTEGER NOT NULL DEFAULT 0,
+    salary_sum REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS department_hire_stats (
+    department_id INTEGER NOT NULL,
+    hire_year TEXT NOT NULL,
+    employee_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (department_id, hire_year)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS employees_stats_insert AFTER INSERT ON employees
+BEGIN
+    INSERT INTO department_stats (department_id, employee_count, salary_sum)
+    VALUES (IFNULL(NEW.department_id, 0), 1, IFNULL(NEW.salary, 0))
+    ON CONFLICT(department_id) DO UPDATE SET
+        employee_count = employee_count + 1,
+        salary_sum = salary_sum + excluded.salary_sum;
+    INSERT INTO department_hire_stats (department_id, hire_year, employee_count)
+    VALUES (IFNULL(NEW.department_id, 0), IFNULL(substr(NEW.hire_date, 1, 4), ''), 1)
+    ON CONFLICT(department_id, hire_year) DO UPDATE SET
+        employee_count = employee_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS employees_stats_delete AFTER DELETE ON employees
+BEGIN
+    UPDATE department_stats SET
+        employee_count = employee_count - 1,
+        salary_sum = salary_sum - IFNULL(OLD.salary, 0)
+    WHERE department_id = IFNULL(OLD.department_id, 0);
+    UPDATE department_hire_stats SET employee_count = employee_count - 1
+    WHERE department_id = IFNULL(OLD.department_id, 0)
+      AND hire_year = IFNULL(substr(OLD.hire_date, 1, 4), '');
+END;
+
+CREATE TRIGGER IF NOT EXISTS employees_stats_update
+AFTER UPDATE OF department_id, salary, hire_date ON employees
+BEGIN
+    UPDATE department_stats SET
+        employee_count = employee_count - 1,
+        salary_sum = salary_sum - IFNULL(OLD.salary, 0)
+    WHERE department_id = IFNULL(OLD.department_id, 0);
+    UPDATE department_hire_stats SET employee_count = employee_count - 1
+    WHERE department_id = IFNULL(OLD.department_id, 0)
+      AND hire_year = IFNULL(substr(OLD.hire_date, 1, 4), '');
+    INSERT INTO department_stats (department_id, employee_count, salary_sum)
+    VALUES (IFNULL(NEW.department_id, 0), 1, IFNULL(NEW.salary, 0))
+    ON CONFLICT(department_id) DO UPDATE SET
+        employee_count = employee_count + 1,
+        salary_sum = salary_sum + excluded.salary_sum;
+    INSERT INTO department_hire_stats (department_id, hire_year, employee_count)
+    VALUES (IFNULL(NEW.department_id, 0), IFNULL(substr(NEW.hire_date, 1, 4), ''), 1)
+    ON CONFLICT(department_id, hire_year) DO UPDATE SET
+        employee_count = employee_count + 1;
+END;
+
+-- Backfill from the existing rows (a full rebuild, so rerunning is harmless)
+DELETE FROM department_stats;
+DELETE FROM department_hire_stats;
+INSERT INTO department_stats (department_id, employee_count, salary_sum)
+    SELECT IFNULL(department_id, 0), COUNT(*), IFNULL(SUM(salary), 0)
+    FROM employees GROUP BY IFNULL(department_id, 0);
+INSERT INTO department_hire_stats (department_id, hire_year, employee_count)
+    SELECT IFNULL(department_id, 0), IFNULL(substr(hire_date, 1, 4), ''), COUNT(*)
+    FROM employees GROUP BY 1, 2;
+"""
+
+EMPLOYEE_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_employees_department_id ON employees (department_id);
+CREATE INDEX IF NOT EXISTS idx_employees_hire_date ON employees (hire_date);
+CREATE INDEX IF NOT EXISTS idx_employees_salary ON employees (salary);
+CREATE INDEX IF NOT EXISTS idx_employees_name ON employees (name);
+ANALYZE;
+"""
+
+# Full-text index over employee and department names. The FTS rowid is the
+# employee id; triggers on both tables keep it in sync.
+EMPLOYEE_SEARCH_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5(
+    name,
+    department,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS employees_fts_insert AFTER INSERT ON employees
+BEGIN
+    INSERT INTO employees_fts (rowid, name, department)
+    VALUES (NEW.id, NEW.name, (SELECT name FROM departments WHERE id = NEW.department_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS employees_fts_delete AFTER DELETE ON employees
+BEGIN
+    DELETE FROM employees_fts WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS employees_fts_update AFTER UPDATE OF name, department_id ON employees
+BEGIN
+    UPDATE employees_fts SET
+        name = NEW.name,
+        department = (SELECT name FROM departments WHERE id = NEW.department_id)
+    WHERE rowid = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS departments_fts_update AFTER UPDATE OF name ON departments
+BEGIN
+    UPDATE employees_fts SET department = NEW.name
+    WHERE rowid IN (SELECT id FROM employees WHERE department_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS departments_fts_delete AFTER DELETE ON departments
+BEGIN
+    UPDATE employees_fts SET department = NULL
+    WHERE rowid IN (SELECT id FROM employees WHERE department_id = OLD.id);
+END;
+
+-- Backfill from the existing rows
+DELETE FROM employees_fts;
+INSERT INTO employees_fts (rowid, name, department)
+    SELECT e.id, e.name, d.name
+    FROM employees e
+    LEFT JOIN departments d ON e.department_id = d.id;
+"""
+
+# Expression indexes matching the coalesced sort keys used by keyset pagination
+# (SORT_COLUMNS in employee_store.py); plain column indexes can't serve those ORDER BYs.
+SORT_KEY_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_employees_salary_sort ON employees (COALESCE(salary, 0));
+CREATE INDEX IF NOT EXISTS idx_employees_hire_date_sort ON employees (COALESCE(hire_date, ''));
+ANALYZE;
+"""
+
+# (version, description, SQL script). Append new migrations; never edit applied ones.
+MIGRATIONS: List[Tuple[int, str, str]] = [
+    (1, "department statistics summary tables and triggers", DEPARTMENT_STATS_SQL),
+    (2, "indexes on employees and ANALYZE", EMPLOYEE_INDEXES_SQL),
+    (3, "FTS5 employee search index", EMPLOYEE_SEARCH_SQL),
+    (4, "expression indexes for salary and hire date sorting", SORT_KEY_INDEXES_SQL),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def split_statements(script: str) -> List[str]:
+    """Split an SQL script into complete statements (trigger bodies stay intact)."""
+    statements = []
+    buffer = ''
+    for line in script.splitlines(keepends=True):
+        if not buffer and (not line.strip() or line.lstrip().startswith('--')):
+            continue
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ''
+    if buffer.strip():
+        raise ValueError(f"Incomplete SQL statement in migration: {buffer.strip()[:60]}")
+    return statements
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get the applied migration version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def has_employee_tables(db_path: str) -> bool:
+    """Check whether a database has the employees and departments tables the migrations build on."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        tables = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('employees', 'departments')")}
+    finally:
+        conn.close()
+    return tables == {'employees', 'departments'}
+
+def run_migrations(db_path: str) -> Tuple[int, int]:
+    """Apply all pending migrations, each in its own transaction.
+    
+    Safe to call from several processes at startup: the version is re-read
+    after taking the write lock, so a migration is never applied twice.
+    Returns (version before, version after).
+    """
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    try:
+        starting_version = get_schema_version(conn)
+        if starting_version >= LATEST_VERSION:
+            return starting_version, starting_version
+        
+        for version, description, script in MIGRATIONS:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if get_schema_version(conn) >= version:
+                    conn.execute("COMMIT")
+                    continue
+                for statement in split_statements(script):
+                    conn.execute(statement)
+                # PRAGMA does not accept bound parameters
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK")
+                raise sqlite3.DatabaseError(f"Migration {version} ({description}) failed: {e}") from e
+        
+        return starting_version, get_schema_version(conn)
+    finally:
+        conn.close()
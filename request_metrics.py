@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Request Metrics
+Per-route latency, SQL and template timing for the Flask app, exposed in Prometheus text format.
+"""
+
+import sqlite3
+import threading
+import time
+from functools import wraps
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from flask import Flask, Response, g, has_request_context, request, template_rendered, before_render_template
+
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """Cumulative bucket counts plus sum and count, as Prometheus expects."""
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Add one observation; callers hold the registry lock."""
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+def _escape(value: Any) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], le: Optional[str] = None) -> str:
+    """Format a Prometheus label set, with an optional histogram "le" label."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class RequestMetrics:
+    def __init__(self):
+        """A thread-safe registry of the app's request, SQL and template metrics."""
+        self._lock = threading.Lock()
+        # metric name -> (help, type, label names, {label values: Histogram or float})
+        self._metrics: Dict[str, tuple] = {}
+        self.define('http_request_duration_seconds', 'histogram', ('route', 'method', 'status'),
+                    "Request latency by route, method and status")
+        self.define('sql_duration_seconds', 'histogram', ('route',),
+                    "Time spent in EmployeeManager database calls per request")
+        self.define('sql_statements_total', 'counter', ('route',), "SQL statements executed")
+        self.define('sql_rows_returned_total', 'counter', ('route',), "Rows returned by EmployeeManager calls")
+        self.define('template_render_seconds', 'histogram', ('template',), "Template render time")
+
+    def define(self, name: str, kind: str, label_names: Tuple[str, ...], help_text: str):
+        """Register a histogram or counter."""
+        self._metrics[name] = (help_text, kind, label_names, {})
+
+    def observe(self, name: str, labels: Tuple[str, ...], value: float):
+        """Add an observation to a histogram."""
+        series = self._metrics[name][3]
+        with self._lock:
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name: str, labels: Tuple[str, ...], amount: float = 1):
+        """Increase a counter."""
+        series = self._metrics[name][3]
+        with self._lock:
+            series[labels] = series.get(labels, 0) + amount
+
+    def render(self, samples: Optional[List[Tuple[str, str, str, Dict[str, str], float]]] = None) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        samples are extra (name, type, help, labels, value) values read at scrape
+        time, such as connection pool and cache counters.
+        """
+        lines = []
+        with self._lock:
+            for name, (help_text, kind, label_names, series) in self._metrics.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(series.items()):
+                    if kind == 'histogram':
+                        for bound, count in zip(value.buckets, value.counts):
+                            lines.append(f"{name}_bucket{_labels(label_names, labels, f'{bound:g}')} {count}")
+                        lines.append(f"{name}_bucket{_labels(label_names, labels, '+Inf')} {value.count}")
+                        lines.append(f"{name}_sum{_labels(label_names, labels)} {value.total:.6f}")
+                        lines.append(f"{name}_count{_labels(label_names, labels)} {value.count}")
+                    else:
+                        lines.append(f"{name}{_labels(label_names, labels)} {value:g}")
+        seen = set()
+        for name, kind, help_text, labels, value in samples or []:
+            if name not in seen:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                seen.add(name)
+            lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {value:g}")
+        return "\n".join(lines) + "\n"
+
+def _request_state() -> Optional[Dict[str, Any]]:
+    """Get the per-request counters, or None outside a request."""
+    if not has_request_context():
+        return None
+    return g.get('_metrics')
+
+def trace_statements(conn: sqlite3.Connection):
+    """Count the statements a connection runs against the current request.
+
+    Install as a connection pool's on_connect hook. Statements run by triggers
+    are reported with a leading comment and are not counted separately.
+    """
+    def on_statement(statement: str):
+        if statement.startswith('--'):
+            return
+        state = _request_state()
+        if state is not None:
+            state['sql_statements'] += 1
+    conn.set_trace_callback(on_statement)
+
+def count_rows(result: Any) -> int:
+    """Estimate rows in an EmployeeManager result: lists, pages, single records."""
+    if result is None or isinstance(result, bool):
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict) and isinstance(result.get('employees'), list):
+        return len(result['employees'])
+    if isinstance(result, dict) and 'inserted' in result:
+        return 0
+    return 1
+
+def timed_db_call(method: Callable) -> Callable:
+    """Add an EmployeeManager method's time and rows to the current request's SQL totals.
+
+    Nested calls are counted once, by the outermost call.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        state = _request_state()
+        if state is None or state['depth']:
+            return method(*args, **kwargs)
+        state['depth'] += 1
+        started = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        finally:
+            state['depth'] -= 1
+            state['sql_time'] += time.perf_counter() - started
+        state['rows'] += count_rows(result)
+        return result
+    return wrapper
+
+def init_app(app: Flask, metrics: RequestMetrics, server_timing: bool = False):
+    """Record every request into metrics; with server_timing, add a Server-Timing header."""
+
+    @app.before_request
+    def start_request_metrics():
+        g._metrics = {
+            'started': time.perf_counter(),
+            'sql_time': 0.0,
+            'sql_statements': 0,
+            'rows': 0,
+            'depth': 0,
+            'render_time': 0.0,
+            'render_started': None,
+        }
+
+    def on_before_render(sender, template, context, **extra):
+        state = _request_state()
+        if state is not None:
+            state['render_started'] = time.perf_counter()
+
+    def on_rendered(sender, template, context, **extra):
+        state = _request_state()
+        if state is not None and state['render_started'] is not None:
+            elapsed = time.perf_counter() - state['render_started']
+            state['render_started'] = None
+            state['render_time'] += elapsed
+            metrics.observe('template_render_seconds', (template.name or 'unknown',), elapsed)
+
+    before_render_template.connect(on_before_render, app, weak=False)
+    template_rendered.connect(on_rendered, app, weak=False)
+
+    @app.after_request
+    def finish_request_metrics(response: Response) -> Response:
+        state = _request_state()
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state['started']
+        route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+        metrics.observe('http_request_duration_seconds', (route, request.method, str(response.status_code)), elapsed)
+        metrics.observe('sql_duration_seconds', (route,), state['sql_time'])
+        metrics.inc('sql_statements_total', (route,), state['sql_statements'])
+        metrics.inc('sql_rows_returned_total', (route,), state['rows'])
+        if server_timing:
+            response.headers.add('Server-Timing', ', '.join([
+                f'sql;dur={state["sql_time"] * 1000:.2f};desc="{state["sql_statements"]} statements, {state["rows"]} rows"',
+                f'render;dur={state["render_time"] * 1000:.2f}',
+                f'total;dur={elapsed * 1000:.2f}',
+            ]))
+        return response
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+An in-memory cache of rendered responses with ETags, invalidated whenever the database changes.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional
+
+class CachedResponse:
+    def __init__(self, body: bytes, mimetype: str):
+        """Store a rendered response body and its strong ETag."""
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha1(body).hexdigest()
+
+class ResponseCache:
+    def __init__(self, version_source: Callable[[], int], max_entries: int = 256):
+        """Initialize the cache.
+        
+        version_source returns a value that changes whenever the underlying data
+        changes (e.g. PRAGMA data_version); the cache is cleared when it does.
+        """
+        self.version_source = version_source
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._data_version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def version(self) -> tuple:
+        """Get the current cache version, clearing stale entries if the data changed."""
+        data_version = self.version_source()
+        with self._lock:
+            if data_version != self._data_version:
+                if self._data_version is not None:
+                    self._clear()
+                self._data_version = data_version
+            return (self._generation, data_version)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Get a cached response, or None on a miss."""
+        self.version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, body: bytes, mimetype: str, version: tuple) -> CachedResponse:
+        """Cache a response rendered at the given version.
+        
+        If the data changed while the response was being rendered it is
+        returned but not stored.
+        """
+        entry = CachedResponse(body, mimetype)
+        current = self.version()
+        with self._lock:
+            if current == version:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self):
+        """Drop every cached response (called after in-process writes)."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        """Clear entries and bump the generation; caller must hold the lock."""
+        self._entries.clear()
+        self._generation += 1
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters for monitoring."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
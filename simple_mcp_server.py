@@ -4,111 +4,1027 @@ Simple MCP Server for SQLite Database Interaction
 This is a minimal implementation of an MCP server that provides safe read-only access to SQLite databases.
 """
 
+import argparse
+import asyncio
 import json
+import math
 import sqlite3
 import sys
 import os
-from typing import Dict, Any, List
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, List, Optional, Union, Iterator
+
+from db_pool import DEFAULT_PRAGMAS, open_connection, read_only_uri
+from migrations import has_employee_tables, run_migrations
+from employee_search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_employees
+from department_cache import DepartmentCache
+from bulk_import import INSERT_EMPLOYEE_SQL, validate_record
+
+# Compiled statements kept per connection (sqlite3 default is 128)
+CACHED_STATEMENTS = 512
+
+# The server opens any SQLite file, so it only applies per-connection cache
+# and timeout settings: the file's journal mode and durability are left as
+# they are, and foreign keys are enforced only if the database asks for it
+CONNECTION_PRAGMAS = {
+    name: value for name, value in DEFAULT_PRAGMAS.items() if name not in ('journal_mode', 'synchronous')
+}
+
+# Server-side result cursors for paging through large SELECT results
+CURSOR_IDLE_TIMEOUT = 300  # seconds
+CURSOR_EXPIRY_INTERVAL = 15  # seconds between background expiry sweeps
+MAX_OPEN_CURSORS = 16
+
+# Shadow tables SQLite creates for each FTS5 table, hidden from get_schema
+FTS5_SHADOW_SUFFIXES = ('data', 'idx', 'content', 'docsize', 'config')
+
+# LRU cache for complete SELECT results
+RESULT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+RESULT_CACHE_MAX_ENTRIES = 1024
+
+# Most records accepted by one insert_employees call
+MAX_INSERT_RECORDS = 10000
+
+# Query instrumentation: the progress handler fires every PROGRESS_INTERVAL
+# SQLite VM instructions, so vm_steps is counted in units of this size. 100
+# resolves page-sized scans while adding only a few percent to tight loops.
+PROGRESS_INTERVAL = 100
+DEFAULT_SLOW_QUERY_MS = 500.0
+
+# Query governor: bounds on the work and output of one query_database or
+# fetch_more call. Rows beyond a budget stay behind a cursor for fetch_more.
+DEFAULT_QUERY_TIMEOUT_MS = 10000.0
+DEFAULT_MAX_ROWS = 10000
+DEFAULT_MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+
+# Concurrent stdio mode (--concurrent)
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_IN_FLIGHT = 32
+
+class ResultCursor:
+    def __init__(self, conn: sqlite3.Connection, cursor: sqlite3.Cursor, query: str,
+                 buffered: List[sqlite3.Row], page_size: int, rows_sent: int):
+        """An open SELECT statement whose remaining rows are fetched page by page.
+        
+        It holds a reference on its connection, so the statement (and its read
+        snapshot) stays valid while other queries run on other connections.
+        """
+        self.conn = conn
+        self.cursor = cursor
+        self.query = query
+        self.buffered = buffered
+        self.page_size = page_size
+        self.rows_sent = rows_sent
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def fetch_page(self, size: int) -> tuple:
+        """Fetch up to size rows (every remaining row if size is 0), returning (rows, has_more)."""
+        if size <= 0:
+            page = self.buffered + self.cursor.fetchall()
+            self.buffered = []
+            self.rows_sent += len(page)
+            self.last_used = time.monotonic()
+            return page, False
+        rows = self.buffered + self.cursor.fetchmany(size + 1 - len(self.buffered))
+        self.buffered = rows[size:]
+        page = rows[:size]
+        self.rows_sent += len(page)
+        self.last_used = time.monotonic()
+        return page, bool(self.buffered)
+    
+    def push_back(self, rows: List[sqlite3.Row]):
+        """Return rows that were fetched but not sent, so the next page starts with them."""
+        self.buffered = rows + self.buffered
+        self.rows_sent -= len(rows)
+    
+    def close(self):
+        """Close the statement (the server releases the connection)."""
+        self.cursor.close()
+
+class QueryMonitor:
+    def __init__(self, conn: sqlite3.Connection, timeout_ms: Optional[float] = None,
+                 interval: int = PROGRESS_INTERVAL):
+        """Measure wall time and VM steps of the statements run on conn inside a with-block.
+        
+        With timeout_ms set, a statement still running after that long is
+        interrupted and raises sqlite3.OperationalError.
+        """
+        self.conn = conn
+        self.timeout_ms = timeout_ms
+        self.interval = interval
+        self.ticks = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+        self.deadline = None
+        self.timed_out = False
+    
+    def _tick(self) -> int:
+        """Progress handler callback; a non-zero return interrupts the statement."""
+        self.ticks += 1
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self.timed_out = True
+            return 1
+        return 0
+    
+    def __enter__(self) -> "QueryMonitor":
+        self.started = time.perf_counter()
+        if self.timeout_ms and self.timeout_ms > 0:
+            self.deadline = self.started + self.timeout_ms / 1000
+        self.conn.set_progress_handler(self._tick, self.interval)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.set_progress_handler(None, 0)
+        self.elapsed = time.perf_counter() - self.started
+        return False
+    
+    def report(self, rows_returned: int) -> Dict[str, Any]:
+        """Get the timing block added to query responses."""
+        return {
+            "elapsed_ms": round(self.elapsed * 1000, 3),
+            "vm_steps": self.ticks * self.interval,
+            # vm_steps is a lower bound, rounded down to a multiple of this
+            "vm_step_interval": self.interval,
+            "rows_returned": rows_returned
+        }
+
+class QueryResultCache:
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        """An LRU cache of SELECT results bounded by entry count and approximate size.
+        
+        Entries belong to one PRAGMA data_version; the cache empties when it changes.
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def make_key(query: str, params: Any, limit: int) -> tuple:
+        """Build a cache key from the SQL text, the parameters and the limit.
+        
+        Only trailing whitespace and semicolons are ignored; whitespace inside
+        the query can be part of a string literal.
+        """
+        return query.rstrip().rstrip(';').rstrip(), json.dumps(params, sort_keys=True, default=str), limit
+    
+    def _check_version(self, version: int):
+        """Drop every entry if the data changed; caller must hold the lock."""
+        if version != self._version:
+            if self._entries:
+                self._entries.clear()
+                self._bytes = 0
+                self.invalidations += 1
+            self._version = version
+    
+    def get(self, key: tuple, version: int) -> Optional[Dict[str, Any]]:
+        """Get a cached result, or None on a miss."""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: tuple, result: Dict[str, Any], version: int):
+        """Cache a result computed at the given data version."""
+        size = len(json.dumps(result, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # A result computed before the data changed is not stored (and must
+            # not move the cache back to the older version)
+            if self._version is None:
+                self._version = version
+            if version != self._version:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop every entry (called after writes)."""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
 
 class SimpleSQLiteMCPServer:
-    def __init__(self, db_path: str):
-        """Initialize the MCP server with a SQLite database path."""
+    def __init__(self, db_path: str, slow_query_log: Optional[str] = None,
+                 slow_query_ms: float = DEFAULT_SLOW_QUERY_MS,
+                 query_timeout_ms: float = DEFAULT_QUERY_TIMEOUT_MS,
+                 max_rows: int = DEFAULT_MAX_ROWS,
+                 max_response_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+                 read_only_selects: bool = False):
+        """Initialize the MCP server with a SQLite database path.
+        
+        If slow_query_log is set, queries taking at least slow_query_ms are
+        appended to that file as JSON lines, with their query plan.
+        
+        query_timeout_ms, max_rows and max_response_bytes bound each call
+        (0 disables a limit). With read_only_selects, reads run on separate
+        mode=ro connections, so they can never write to the database.
+        """
         self.db_path = db_path
+        self.slow_query_log = slow_query_log
+        self.slow_query_ms = slow_query_ms
+        self.query_timeout_ms = query_timeout_ms
+        self.max_rows = max_rows
+        self.max_response_bytes = max_response_bytes
+        self.read_only_selects = read_only_selects
+        self._slow_log_lock = threading.Lock()
         if not os.path.exists(db_path):
             raise FileNotFoundError(f"Database file not found: {db_path}")
+        # The server works with any SQLite database; only employee databases are migrated
+        if has_employee_tables(db_path):
+            run_migrations(db_path)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._cursors: Dict[str, ResultCursor] = {}
+        self._cursors_lock = threading.Lock()
+        # Connections shared by result cursors and batch snapshots, released at zero references
+        self._connection_refs: Dict[int, int] = {}
+        self._connection_refs_lock = threading.Lock()
+        # Thread connections given to a cursor come back here when it closes, so
+        # they (and their statement caches) are reused instead of reopened
+        self._connection_kinds: Dict[int, str] = {}
+        self._connections_opened = 0
+        self._spare: Dict[str, List[sqlite3.Connection]] = {'conn': [], 'reader': []}
+        self._spare_lock = threading.Lock()
+        # (PRAGMA schema_version, schema) from the last get_schema call
+        self._schema_cache = None
+        self.result_cache = QueryResultCache()
+        # Never writes, so its data_version changes whenever any other connection commits
+        self._watcher = sqlite3.connect(db_path, check_same_thread=False)
+        self._watcher_lock = threading.Lock()
+        self.departments = DepartmentCache(self._load_departments, self.data_version)
+        # Idle cursors hold read transactions (pinning the WAL), so expire them even when no calls arrive
+        self._expiry_stop = threading.Event()
+        self._expiry_thread = threading.Thread(target=self._expire_periodically, name='cursor-expiry', daemon=True)
+        self._expiry_thread.start()
+    
+    def get_connection(self, read_only: bool = False) -> sqlite3.Connection:
+        """Get this thread's long-lived connection, opening it on first use.
+        
+        Each worker thread keeps its own connection (and statement cache) for
+        the lifetime of the server. With read_only_selects, read_only calls get
+        the thread's separate mode=ro reader connection. Queries should go
+        through connection().
+        """
+        attr = 'reader' if read_only and self.read_only_selects else 'conn'
+        conn = getattr(self._local, attr, None)
+        if conn is None:
+            with self._spare_lock:
+                conn = self._spare[attr].pop() if self._spare[attr] else None
+            if conn is None:
+                conn = self._open(read_only=attr == 'reader')
+                with self._connections_lock:
+                    self._connections.append(conn)
+                    self._connection_kinds[id(conn)] = attr
+                    self._connections_opened += 1
+            setattr(self._local, attr, conn)
+        return conn
+    
+    def _open(self, read_only: bool = False, **kwargs) -> sqlite3.Connection:
+        """Open a connection to the database, through a mode=ro URI if read_only."""
+        if read_only:
+            return open_connection(read_only_uri(self.db_path), pragmas=CONNECTION_PRAGMAS, uri=True,
+                                   cached_statements=CACHED_STATEMENTS, **kwargs)
+        return open_connection(self.db_path, pragmas=CONNECTION_PRAGMAS, cached_statements=CACHED_STATEMENTS,
+                               **kwargs)
+    
+    @contextmanager
+    def connection(self, read_only: bool = False) -> Iterator[sqlite3.Connection]:
+        """Use a connection for one operation, committing or rolling back at the end.
+        
+        Inside snapshot() the batch's snapshot connection is used instead and
+        its transaction is left open for the following calls.
+        """
+        snapshot_conn = getattr(self._local, 'snapshot', None)
+        if snapshot_conn is not None:
+            yield snapshot_conn
+            return
+        conn = self.get_connection(read_only)
+        with conn:
+            yield conn
+    
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Run this thread's calls on one connection inside one read transaction.
+        
+        Every query in the block sees the same consistent snapshot of the database.
+        The thread's own connection is used (keeping its statement cache); it is
+        held like a cursor's for the block, so cursors opened in the block can
+        share it and it returns to the thread afterwards.
+        """
+        conn = self.get_connection(read_only=True)
+        self._detach_connection(conn)
+        self._retain(conn)
+        try:
+            conn.execute("BEGIN")
+            # The read transaction (and its snapshot) starts with the first read
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            self._local.snapshot_version = self.data_version()
+            self._local.snapshot = conn
+            yield conn
+        finally:
+            self._local.snapshot = None
+            try:
+                # Cursors opened in the block keep reading their statement's snapshot after COMMIT
+                if conn.in_transaction:
+                    conn.execute("COMMIT")
+            finally:
+                self._release(conn)
+    
+    def data_version(self) -> int:
+        """Get PRAGMA data_version from the watcher connection."""
+        with self._watcher_lock:
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+    
+    def _retain(self, conn: sqlite3.Connection):
+        """Add a reference to a shared connection."""
+        with self._connection_refs_lock:
+            self._connection_refs[id(conn)] = self._connection_refs.get(id(conn), 0) + 1
+    
+    def _release(self, conn: sqlite3.Connection):
+        """Drop a reference to a shared connection.
+        
+        With the last reference, a thread connection becomes a spare for
+        get_connection to reuse; any other connection is closed.
+        """
+        with self._connection_refs_lock:
+            refs = self._connection_refs.pop(id(conn)) - 1
+            if refs:
+                self._connection_refs[id(conn)] = refs
+        if refs:
+            return
+        with self._connections_lock:
+            kind = self._connection_kinds.get(id(conn))
+        if kind is not None:
+            if conn.in_transaction:
+                conn.rollback()
+            with self._spare_lock:
+                if len(self._spare[kind]) < MAX_OPEN_CURSORS:
+                    self._spare[kind].append(conn)
+                    return
+            with self._connections_lock:
+                self._connections.remove(conn)
+                del self._connection_kinds[id(conn)]
+        conn.close()
+    
+    def _detach_connection(self, conn: sqlite3.Connection):
+        """Hand this thread's connection over to a result cursor; the thread takes a spare or opens one next time."""
+        for attr in ('conn', 'reader'):
+            if getattr(self._local, attr, None) is conn:
+                setattr(self._local, attr, None)
+    
+    def _open_cursor(self, conn: sqlite3.Connection, cursor: sqlite3.Cursor, query: str,
+                     buffered: List[sqlite3.Row], page_size: int, rows_sent: int) -> str:
+        """Register an open SELECT for fetch_more and return its cursor id."""
+        if conn is getattr(self._local, 'conn', None) or conn is getattr(self._local, 'reader', None):
+            self._detach_connection(conn)
+        self._retain(conn)
+        cursor_id = uuid.uuid4().hex
+        evicted = []
+        with self._cursors_lock:
+            self._cursors[cursor_id] = ResultCursor(conn, cursor, query, buffered, page_size, rows_sent)
+            # Keep the number of open statements bounded: drop the least recently used
+            while len(self._cursors) > MAX_OPEN_CURSORS:
+                oldest = min(self._cursors, key=lambda key: self._cursors[key].last_used)
+                evicted.append(self._cursors.pop(oldest))
+        for result_cursor in evicted:
+            self._close_result_cursor(result_cursor)
+        return cursor_id
+    
+    def _expire_periodically(self):
+        """Background loop running expire_cursors until the server is closed."""
+        while not self._expiry_stop.wait(CURSOR_EXPIRY_INTERVAL):
+            self.expire_cursors()
+    
+    def expire_cursors(self):
+        """Close cursors that have been idle for longer than CURSOR_IDLE_TIMEOUT."""
+        cutoff = time.monotonic() - CURSOR_IDLE_TIMEOUT
+        with self._cursors_lock:
+            expired = [key for key, result_cursor in self._cursors.items() if result_cursor.last_used < cutoff]
+            expired_cursors = [self._cursors.pop(key) for key in expired]
+        for result_cursor in expired_cursors:
+            self._close_result_cursor(result_cursor)
+    
+    def fetch_more(self, cursor_id: str, limit: Optional[int] = None,
+                   timeout_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Fetch the next page from a cursor returned by execute_query.
+        
+        timeout_ms can lower (never raise) the server's time limit for this call.
+        """
+        self.expire_cursors()
+        with self._cursors_lock:
+            result_cursor = self._cursors.get(cursor_id)
+        if result_cursor is None:
+            return {"error": f"Unknown or expired cursor: {cursor_id}"}
+        
+        monitor = QueryMonitor(result_cursor.conn, self._time_limit(timeout_ms))
+        try:
+            with result_cursor.lock:
+                size, limited_by = self._page_size(limit if limit and limit > 0 else result_cursor.page_size)
+                with monitor:
+                    rows, has_more = result_cursor.fetch_page(size)
+                data, unsent, over_bytes = self._fit_response(rows)
+                if unsent:
+                    result_cursor.push_back(unsent)
+                    has_more = True
+        except sqlite3.Error as e:
+            self.close_cursor(cursor_id)
+            if monitor.timed_out:
+                return {"error": self._timeout_message(monitor)}
+            return {"error": f"SQL error: {str(e)}"}
+        
+        result = {
+            "success": True,
+            "data": data,
+            "row_count": len(data),
+            "rows_sent": result_cursor.rows_sent,
+            "has_more": has_more,
+            "timing": monitor.report(len(data)),
+        }
+        if over_bytes:
+            result["limited_by"] = "max_response_bytes"
+        elif limited_by and has_more:
+            result["limited_by"] = limited_by
+        if has_more:
+            result["cursor_id"] = cursor_id
+        else:
+            self.close_cursor(cursor_id)
+        return result
+    
+    def close_cursor(self, cursor_id: str) -> Dict[str, Any]:
+        """Close a cursor before it is exhausted."""
+        with self._cursors_lock:
+            result_cursor = self._cursors.pop(cursor_id, None)
+        if result_cursor is None:
+            return {"error": f"Unknown or expired cursor: {cursor_id}"}
+        self._close_result_cursor(result_cursor)
+        return {"success": True, "cursor_id": cursor_id}
+    
+    def _close_result_cursor(self, result_cursor: ResultCursor):
+        """Close a cursor's statement and release its connection."""
+        with result_cursor.lock:
+            result_cursor.close()
+        self._release(result_cursor.conn)
+    
+    def close(self):
+        """Close every connection and cursor opened by the server."""
+        self._expiry_stop.set()
+        with self._cursors_lock:
+            cursors = list(self._cursors.values())
+            self._cursors.clear()
+        for result_cursor in cursors:
+            self._close_result_cursor(result_cursor)
+        with self._spare_lock:
+            for spares in self._spare.values():
+                spares.clear()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._connection_kinds.clear()
+        self._local = threading.local()
+        with self._watcher_lock:
+            self._watcher.close()
     
     def get_schema(self) -> Dict[str, Any]:
-        """Get the database schema information."""
+        """Get the database schema information.
+        
+        Returns, per table, its columns, indexes, foreign keys and a row-count
+        estimate from sqlite_stat1 (None if ANALYZE has not run). The result is
+        cached and revalidated with a single PRAGMA schema_version check;
+        estimates reflect sqlite_stat1 as of the last schema change.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                # Get all tables
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-                tables = cursor.fetchall()
-                
-                schema = {}
-                for table in tables:
-                    table_name = table['name']
-                    if table_name != 'sqlite_sequence':  # Skip system table
-                        cursor.execute(f"PRAGMA table_info({table_name})")
-                        columns = cursor.fetchall()
-                        schema[table_name] = [
-                            {
-                                'name': col['name'],
-                                'type': col['type'],
-                                'notnull': bool(col['notnull']),
-                                'pk': bool(col['pk'])
-                            }
-                            for col in columns
-                        ]
-                
-                return schema
+            with self.connection(read_only=True) as conn:
+                schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+                cached = self._schema_cache
+                if cached is not None and cached[0] == schema_version:
+                    return cached[1]
+                schema = self._read_schema(conn)
+            self._schema_cache = (schema_version, schema)
+            return schema
         except sqlite3.Error as e:
             return {"error": f"Database error: {str(e)}"}
     
-    def execute_query(self, query: str, limit: int = 100) -> Dict[str, Any]:
-        """Execute SQL query with safety checks."""
+    def _read_schema(self, conn: sqlite3.Connection) -> Dict[str, Any]:
+        """Introspect tables, columns, indexes, foreign keys and row estimates."""
+        cursor = conn.cursor()
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='table' ORDER BY rowid")
+        tables = cursor.fetchall()
+        
+        # FTS5 tables keep their data in "<name>_data", "<name>_idx", ... shadow tables
+        virtual_tables = [
+            table['name'] for table in tables
+            if (table['sql'] or '').upper().startswith('CREATE VIRTUAL TABLE')
+        ]
+        shadow_tables = {f"{virtual}_{suffix}" for virtual in virtual_tables for suffix in FTS5_SHADOW_SUFFIXES}
+        
+        row_estimates = {}
+        if any(table['name'] == 'sqlite_stat1' for table in tables):
+            cursor.execute("SELECT tbl, stat FROM sqlite_stat1")
+            for stat in cursor.fetchall():
+                # The first number of each stat entry is the table's row count
+                estimate = int((stat['stat'] or '0').split()[0])
+                row_estimates[stat['tbl']] = max(estimate, row_estimates.get(stat['tbl'], 0))
+        
+        schema = {}
+        for table in tables:
+            table_name = table['name']
+            if table_name.startswith('sqlite_'):  # Skip system tables
+                continue
+            if table_name in shadow_tables:
+                continue
+            quoted = '"' + table_name.replace('"', '""') + '"'
+            
+            cursor.execute(f"PRAGMA table_info({quoted})")
+            columns = [
+                {
+                    'name': col['name'],
+                    'type': col['type'],
+                    'notnull': bool(col['notnull']),
+                    'pk': bool(col['pk'])
+                }
+                for col in cursor.fetchall()
+            ]
+            
+            cursor.execute(f"PRAGMA index_list({quoted})")
+            indexes = []
+            for index in cursor.fetchall():
+                indexes.append({
+                    'name': index['name'],
+                    'columns': self._index_columns(conn, index['name']),
+                    'unique': bool(index['unique']),
+                    'origin': index['origin']
+                })
+            
+            cursor.execute(f"PRAGMA foreign_key_list({quoted})")
+            foreign_keys = [
+                {
+                    'column': fk['from'],
+                    'references_table': fk['table'],
+                    'references_column': fk['to'],
+                    'on_update': fk['on_update'],
+                    'on_delete': fk['on_delete']
+                }
+                for fk in cursor.fetchall()
+            ]
+            
+            schema[table_name] = {
+                'columns': columns,
+                'indexes': indexes,
+                'foreign_keys': foreign_keys,
+                'row_estimate': row_estimates.get(table_name),
+                'virtual': table_name in virtual_tables
+            }
+        
+        return schema
+    
+    @classmethod
+    def _index_columns(cls, conn: sqlite3.Connection, index_name: str) -> List[str]:
+        """Get the columns of an index, with the SQL text of any expression terms."""
+        quoted = '"' + index_name.replace('"', '""') + '"'
+        key_columns = [col for col in conn.execute(f"PRAGMA index_xinfo({quoted})").fetchall() if col['key']]
+        terms = []
+        if any(col['cid'] == -2 for col in key_columns):
+            row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?",
+                               (index_name,)).fetchone()
+            terms = cls._index_terms(row['sql'] if row else None)
+        columns = []
+        for col in key_columns:
+            if col['cid'] == -2:
+                columns.append(terms[col['seqno']] if col['seqno'] < len(terms) else None)
+            else:
+                columns.append(col['name'])
+        return columns
+    
+    @staticmethod
+    def _index_terms(sql: Optional[str]) -> List[str]:
+        """Split the indexed expressions (without ASC/DESC) out of a CREATE INDEX statement."""
+        if not sql:
+            return []
+        start = sql.find('(', sql.upper().find(' ON '))
+        terms = []
+        current = ''
+        depth = 0
+        quote = None
+        for char in sql[start + 1:]:
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '\'"`[':
+                quote = ']' if char == '[' else char
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                if depth == 0:
+                    break
+                depth -= 1
+            elif char == ',' and depth == 0:
+                terms.append(current)
+                current = ''
+                continue
+            current += char
+        terms.append(current)
+        stripped = []
+        for term in terms:
+            words = term.strip().rsplit(None, 1)
+            if len(words) == 2 and words[1].upper() in ('ASC', 'DESC'):
+                words = words[:1]
+            stripped.append(' '.join(words))
+        return stripped
+    
+    def execute_query(self, query: str, limit: int = 100,
+                      params: Optional[Union[List[Any], Dict[str, Any]]] = None,
+                      timeout_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Execute SQL query with safety checks.
+        
+        params are bound to ? (list) or :name (dict) placeholders, so repeated
+        queries reuse the connection's compiled statement instead of re-parsing.
+        timeout_ms can lower (never raise) the server's time limit for this call.
+        """
+        started = time.perf_counter()
         query_upper = query.strip().upper()
         
-        # Allow SELECT, INSERT, UPDATE, DELETE operations
-        allowed_operations = ['SELECT', 'INSERT', 'UPDATE', 'DELETE']
-        if not any(query_upper.startswith(op) for op in allowed_operations):
-            return {"error": "Only SELECT, INSERT, UPDATE, DELETE queries are allowed"}
+        params = self._normalize_params(params)
+        if params is None:
+            return {"error": "params must be an array (for ? placeholders) or an object (for :name placeholders)"}
         
-        # Prevent dangerous operations
-        dangerous_keywords = ['DROP', 'CREATE', 'ALTER', 'TRUNCATE', 'EXEC', 'EXECUTE']
-        if any(keyword in query_upper for keyword in dangerous_keywords):
-            return {"error": "Dangerous operations not allowed"}
+        error = self._check_query(query_upper)
+        if error:
+            return {"error": error}
         
+        self.expire_cursors()
+        
+        # Complete SELECT results are cached until the data changes. Inside a
+        # batch snapshot the cache is only used if nothing was committed since
+        # the snapshot began, so cached results match the snapshot.
+        is_select = query_upper.startswith('SELECT')
+        cache_key = None
+        if is_select:
+            version = self.data_version()
+            in_snapshot = getattr(self._local, 'snapshot', None) is not None
+            if not in_snapshot or version == self._local.snapshot_version:
+                cache_key = QueryResultCache.make_key(query, params, limit)
+                cached = self.result_cache.get(cache_key, version)
+                if cached is not None:
+                    timing = {
+                        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+                        "vm_steps": 0,
+                        "vm_step_interval": PROGRESS_INTERVAL,
+                        "rows_returned": cached["row_count"]
+                    }
+                    return dict(cached, cached=True, timing=timing)
+        
+        monitor = None
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.connection(read_only=is_select) as conn:
                 cursor = conn.cursor()
+                monitor = QueryMonitor(conn, self._time_limit(timeout_ms))
                 
-                # Add LIMIT if not present and limit is specified (only for SELECT)
-                if query_upper.startswith('SELECT') and 'LIMIT' not in query_upper and limit > 0:
-                    query = f"{query.rstrip(';')} LIMIT {limit}"
-                
-                cursor.execute(query)
-                
-                # For SELECT queries, fetch and return results
-                if query_upper.startswith('SELECT'):
-                    results = cursor.fetchall()
-                    data = [dict(row) for row in results]
-                    conn.commit()
-                    return {
+                # For SELECT queries, return the first page (limit rows, within the
+                # row and byte budgets). If more rows remain, the statement stays
+                # open behind a cursor_id that fetch_more reads from, so the query
+                # is never re-run.
+                if is_select:
+                    page_size, limited_by = self._page_size(limit)
+                    with monitor:
+                        cursor.execute(query, params)
+                        if page_size > 0:
+                            rows = cursor.fetchmany(page_size + 1)
+                        else:
+                            rows = cursor.fetchall()
+                    data, unsent, over_bytes = self._fit_response(rows[:page_size] if page_size > 0 else rows)
+                    remaining = unsent + rows[page_size:] if page_size > 0 else unsent
+                    has_more = bool(remaining)
+                    result = {
                         "success": True,
                         "data": data,
                         "row_count": len(data),
-                        "query": query
+                        "query": query,
+                        "has_more": has_more
                     }
+                    if over_bytes:
+                        result["limited_by"] = "max_response_bytes"
+                    elif limited_by and has_more:
+                        result["limited_by"] = limited_by
+                    if has_more:
+                        result["cursor_id"] = self._open_cursor(conn, cursor, query, remaining, page_size or limit, len(data))
+                    elif cache_key is not None:
+                        self.result_cache.put(cache_key, result, version)
+                    timing = monitor.report(len(data))
+                    result = dict(result, timing=timing)
                 else:
                     # For INSERT, UPDATE, DELETE queries
-                    conn.commit()
+                    with monitor:
+                        cursor.execute(query, params)
+                        conn.commit()
+                    self.result_cache.clear()
                     affected_rows = cursor.rowcount
-                    return {
+                    timing = monitor.report(0)
+                    result = {
                         "success": True,
                         "message": f"Query executed successfully",
                         "affected_rows": affected_rows,
-                        "query": query
+                        "query": query,
+                        "timing": timing
                     }
         
         except sqlite3.Error as e:
+            if monitor is not None and monitor.timed_out:
+                if self.slow_query_log:
+                    self._log_slow_query(query, params, monitor.report(0), timed_out=True)
+                return {"error": self._timeout_message(monitor)}
             return {"error": f"SQL error: {str(e)}"}
+        
+        if self.slow_query_log and timing["elapsed_ms"] >= self.slow_query_ms:
+            self._log_slow_query(query, params, timing)
+        return result
+    
+    def _page_size(self, limit: int) -> tuple:
+        """Clamp a requested page size to max_rows, returning (size, limited_by).
+        
+        A size of 0 means no limit; limited_by is "max_rows" if the budget applied.
+        """
+        if self.max_rows > 0 and (limit <= 0 or limit > self.max_rows):
+            return self.max_rows, "max_rows"
+        return max(limit, 0), None
+    
+    def _fit_response(self, rows: List[sqlite3.Row]) -> tuple:
+        """Convert rows to dicts until max_response_bytes of JSON is reached.
+        
+        Returns (data, unsent_rows, over_budget). At least one row is always
+        sent, so paging through a result with fetch_more makes progress.
+        """
+        if self.max_response_bytes <= 0:
+            return [dict(row) for row in rows], [], False
+        data = []
+        size = 0
+        for index, row in enumerate(rows):
+            item = dict(row)
+            size += len(json.dumps(item, default=str)) + 2
+            if data and size > self.max_response_bytes:
+                return data, rows[index:], True
+            data.append(item)
+        return data, [], False
+    
+    def _time_limit(self, timeout_ms: Optional[float]) -> float:
+        """Get the time limit for one call: the server's, or a lower one the caller asked for."""
+        if timeout_ms is None or timeout_ms <= 0:
+            return self.query_timeout_ms
+        if self.query_timeout_ms > 0:
+            return min(timeout_ms, self.query_timeout_ms)
+        return timeout_ms
+    
+    @staticmethod
+    def _timeout_message(monitor: QueryMonitor) -> str:
+        """Error returned when the governor interrupts a query."""
+        return f"Query interrupted: exceeded the {monitor.timeout_ms:g} ms time limit"
+    
+    @staticmethod
+    def _normalize_params(params: Any) -> Optional[Union[tuple, Dict[str, Any]]]:
+        """Convert tool params to what sqlite3 binds; None if they are the wrong type."""
+        if params is None:
+            return ()
+        if isinstance(params, list):
+            return tuple(params)
+        if isinstance(params, dict):
+            return params
+        return None
+    
+    @staticmethod
+    def _check_query(query_upper: str) -> Optional[str]:
+        """Apply the safety checks, returning an error message or None."""
+        # Allow SELECT, INSERT, UPDATE, DELETE operations
+        allowed_operations = ['SELECT', 'INSERT', 'UPDATE', 'DELETE']
+        if not any(query_upper.startswith(op) for op in allowed_operations):
+            return "Only SELECT, INSERT, UPDATE, DELETE queries are allowed"
+        
+        # Prevent dangerous operations
+        dangerous_keywords = ['DROP', 'CREATE', 'ALTER', 'TRUNCATE', 'EXEC', 'EXECUTE']
+        if any(keyword in query_upper for keyword in dangerous_keywords):
+            return "Dangerous operations not allowed"
+        return None
+    
+    def explain_query(self, query: str, params: Optional[Union[List[Any], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Get the EXPLAIN QUERY PLAN for a query without running it.
+        
+        full_scans lists the plan steps that read every row of a table or index.
+        """
+        params = self._normalize_params(params)
+        if params is None:
+            return {"error": "params must be an array (for ? placeholders) or an object (for :name placeholders)"}
+        error = self._check_query(query.strip().upper())
+        if error:
+            return {"error": error}
+        
+        try:
+            with self.connection(read_only=True) as conn:
+                plan = self._query_plan(conn, query, params)
+        except sqlite3.Error as e:
+            return {"error": f"SQL error: {str(e)}"}
+        
+        return {
+            "success": True,
+            "query": query,
+            "plan": plan,
+            "full_scans": [step["detail"] for step in plan if self._is_full_scan(step["detail"])]
+        }
+    
+    @staticmethod
+    def _query_plan(conn: sqlite3.Connection, query: str, params: Any) -> List[Dict[str, Any]]:
+        """Run EXPLAIN QUERY PLAN and return its steps."""
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        return [{"id": row[0], "parent": row[1], "detail": row[3]} for row in rows]
+    
+    @staticmethod
+    def _is_full_scan(detail: str) -> bool:
+        """Check whether a plan step reads every row of a table or index (SCAN rather than SEARCH)."""
+        return detail.startswith('SCAN ') and 'CONSTANT ROW' not in detail
+    
+    def _log_slow_query(self, query: str, params: Any, timing: Dict[str, Any], timed_out: bool = False):
+        """Append a slow query, its timing and its plan to the slow-query log."""
+        entry = {
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "query": query,
+            "params": params,
+            "timing": timing,
+        }
+        if timed_out:
+            entry["timed_out"] = True
+        try:
+            with self.connection(read_only=True) as conn:
+                entry["plan"] = [step["detail"] for step in self._query_plan(conn, query, params)]
+        except sqlite3.Error:
+            pass
+        line = json.dumps(entry, default=str)
+        try:
+            with self._slow_log_lock:
+                with open(self.slow_query_log, 'a', encoding='utf-8') as log_file:
+                    log_file.write(line + "\n")
+        except OSError as e:
+            print(f"Warning: cannot write slow query log: {e}", file=sys.stderr)
+    
+    def _load_departments(self) -> List[Dict[str, Any]]:
+        """Read all departments from the database."""
+        with self.connection(read_only=True) as conn:
+            return [dict(row) for row in conn.execute("SELECT * FROM departments ORDER BY id")]
+    
+    def insert_employees(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Insert employee records in one transaction with executemany and bound parameters.
+        
+        Each record is validated against the cached department ids first.
+        Valid records are inserted and invalid ones are reported. The result
+        lists, per input record, either its new id or its error.
+        """
+        if not isinstance(records, list) or not records:
+            return {"error": "records must be a non-empty array of employee objects"}
+        if len(records) > MAX_INSERT_RECORDS:
+            return {"error": f"At most {MAX_INSERT_RECORDS} records can be inserted per call"}
+        
+        try:
+            department_ids = self.departments.ids()
+        except sqlite3.Error as e:
+            return {"error": f"Database error: {str(e)}"}
+        
+        results: List[Dict[str, Any]] = []
+        valid = []
+        for index, record in enumerate(records):
+            if not isinstance(record, dict):
+                results.append({"index": index, "error": "Record must be an object"})
+                continue
+            try:
+                valid.append((index, validate_record(record, department_ids)))
+                results.append({"index": index})
+            except ValueError as e:
+                results.append({"index": index, "error": str(e)})
+        
+        if valid:
+            try:
+                with self.connection() as conn:
+                    conn.executemany(INSERT_EMPLOYEE_SQL, [params for _, params in valid])
+                    # employees uses AUTOINCREMENT and the write lock is held for the
+                    # whole statement, so the new ids are consecutive up to the last one
+                    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            except sqlite3.Error as e:
+                return {"error": f"SQL error: {str(e)}"}
+            self.result_cache.clear()
+            first_id = last_id - len(valid) + 1
+            for offset, (index, _) in enumerate(valid):
+                results[index]["id"] = first_id + offset
+        
+        return {
+            "success": bool(valid),
+            "inserted": len(valid),
+            "rejected": len(records) - len(valid),
+            "results": results
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get server counters: result cache, open cursors and connections."""
+        with self._cursors_lock:
+            open_cursors = len(self._cursors)
+        with self._connections_lock:
+            connections = len(self._connections)
+            opened = self._connections_opened
+        with self._spare_lock:
+            spare = sum(len(spares) for spares in self._spare.values())
+        return {
+            "success": True,
+            "result_cache": self.result_cache.stats(),
+            "open_cursors": open_cursors,
+            "worker_connections": connections,
+            "spare_connections": spare,
+            "connections_opened": opened,
+        }
     
     def list_tables(self) -> Dict[str, Any]:
-        """List all tables in the database."""
+        """List all tables in the database (served from the schema cache)."""
+        schema = self.get_schema()
+        if "error" in schema:
+            return schema
+        return {"success": True, "tables": list(schema)}
+
+    def search_employees(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> Dict[str, Any]:
+        """Full-text search on employee and department names."""
+        if not query or not query.strip():
+            return {"error": "Search query cannot be empty"}
+        limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
-                tables = [row[0] for row in cursor.fetchall()]
-                return {"success": True, "tables": tables}
+            with self.connection(read_only=True) as conn:
+                results = search_employees(conn, query, limit)
+                return {"success": True, "data": results, "row_count": len(results)}
         except sqlite3.Error as e:
             return {"error": f"Database error: {str(e)}"}
 
+class InvalidParams(ValueError):
+    """A tool argument has the wrong type or value (JSON-RPC error -32602)."""
+
+def numeric_argument(arguments: Dict[str, Any], name: str, default: Any, convert: Callable = int,
+                     minimum: float = 0) -> Any:
+    """Get a numeric tool argument, also accepting numeric strings such as "10".
+    
+    Raises InvalidParams if the value is not a number of the right kind or is below minimum.
+    """
+    value = arguments.get(name)
+    if value is None:
+        return default
+    try:
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError
+        number = float(value)
+        if not math.isfinite(number) or (convert is int and not number.is_integer()):
+            raise ValueError
+    except ValueError:
+        kind = "an integer" if convert is int else "a number"
+        raise InvalidParams(f"Invalid params: {name} must be {kind}, got {json.dumps(value, default=str)}")
+    if number < minimum:
+        raise InvalidParams(f"Invalid params: {name} must be at least {minimum:g}")
+    return convert(number)
+
 def handle_mcp_request(server: SimpleSQLiteMCPServer, request: Dict[str, Any]) -> Dict[str, Any]:
     """Handle MCP protocol requests."""
     method = request.get('method', '')
@@ -143,14 +1059,51 @@ def handle_mcp_request(server: SimpleSQLiteMCPServer, request: Dict[str, Any]) -
                             "type": "object",
                             "properties": {
                                 "query": {"type": "string", "description": "SQL query to execute (SELECT, INSERT, UPDATE, DELETE)"},
-                                "limit": {"type": "integer", "description": "Maximum number of rows to return for SELECT queries", "default": 100}
+                                "limit": {"type": "integer", "description": "Page size for SELECT queries; if more rows remain the response has has_more=true and a cursor_id for fetch_more (0 returns everything, up to the server's row and size budgets)", "default": 100},
+                                "params": {
+                                    "type": ["array", "object"],
+                                    "description": "Values bound to ? placeholders (array) or :name placeholders (object); prefer this over inlining values"
+                                },
+                                "timeout_ms": {"type": "number", "description": "Interrupt the query after this many milliseconds (at most the server's own limit)"}
                             },
                             "required": ["query"]
                         }
                     },
+                    {
+                        "name": "fetch_more",
+                        "description": "Fetch the next page of a SELECT result that returned has_more=true and a cursor_id",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "cursor_id": {"type": "string", "description": "cursor_id from query_database or a previous fetch_more"},
+                                "limit": {"type": "integer", "description": "Rows to return (defaults to the original page size)"},
+                                "timeout_ms": {"type": "number", "description": "Interrupt the fetch after this many milliseconds (at most the server's own limit)"}
+                            },
+                            "required": ["cursor_id"]
+                        }
+                    },
+                    {
+                        "name": "close_cursor",
+                        "description": "Release a result cursor that will not be read to the end",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "cursor_id": {"type": "string", "description": "cursor_id to close"}
+                            },
+                            "required": ["cursor_id"]
+                        }
+                    },
+                    {
+                        "name": "server_stats",
+                        "description": "Get server statistics: result cache hits/misses/size, open cursors and connections",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {}
+                        }
+                    },
                     {
                         "name": "get_schema",
-                        "description": "Get the database schema information",
+                        "description": "Get the database schema: columns, indexes, foreign keys and row-count estimates for each table",
                         "inputSchema": {
                             "type": "object",
                             "properties": {}
@@ -164,6 +1117,57 @@ def handle_mcp_request(server: SimpleSQLiteMCPServer, request: Dict[str, Any]) -
                             "properties": {}
                         }
                     },
+                    {
+                        "name": "search_employees",
+                        "description": "Full-text search employees by name or department name (prefix matching, best matches first)",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "query": {"type": "string", "description": "Words to search for, e.g. 'ali eng'"},
+                                "limit": {"type": "integer", "description": "Maximum number of matches to return", "default": DEFAULT_SEARCH_LIMIT}
+                            },
+                            "required": ["query"]
+                        }
+                    },
+                    {
+                        "name": "explain_query",
+                        "description": "Show the query plan SQLite would use for a query, without running it; full_scans lists steps that read a whole table or index",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "query": {"type": "string", "description": "SQL query to explain"},
+                                "params": {
+                                    "type": ["array", "object"],
+                                    "description": "Values bound to ? (array) or :name (object) placeholders in the query"
+                                }
+                            },
+                            "required": ["query"]
+                        }
+                    },
+                    {
+                        "name": "insert_employees",
+                        "description": "Insert many employee records in one transaction; returns the new id or an error for each record",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {
+                                "records": {
+                                    "type": "array",
+                                    "description": f"Employee records to insert (at most {MAX_INSERT_RECORDS})",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "name": {"type": "string", "description": "Employee name"},
+                                            "department_id": {"type": "integer", "description": "Department ID"},
+                                            "salary": {"type": "number", "description": "Employee salary"},
+                                            "hire_date": {"type": "string", "description": "Hire date (YYYY-MM-DD format)"}
+                                        },
+                                        "required": ["name", "department_id", "salary", "hire_date"]
+                                    }
+                                }
+                            },
+                            "required": ["records"]
+                        }
+                    },
                     {
                         "name": "insert_employee",
                         "description": "Insert a new employee record into the employees table",
@@ -188,8 +1192,10 @@ def handle_mcp_request(server: SimpleSQLiteMCPServer, request: Dict[str, Any]) -
         
         if tool_name == 'query_database':
             query = arguments.get('query', '')
-            limit = arguments.get('limit', 100)
-            result = server.execute_query(query, limit)
+            limit = numeric_argument(arguments, 'limit', 100)
+            timeout_ms = numeric_argument(arguments, 'timeout_ms', None, float, minimum=1)
+            query_params = arguments.get('params')
+            result = server.execute_query(query, limit, query_params, timeout_ms)
             
             return {
                 "jsonrpc": "2.0",
@@ -204,6 +1210,55 @@ def handle_mcp_request(server: SimpleSQLiteMCPServer, request: Dict[str, Any]) -
                 }
             }
         
+        elif tool_name == 'fetch_more':
+            cursor_id = arguments.get('cursor_id', '')
+            limit = numeric_argument(arguments, 'limit', None, minimum=1)
+            timeout_ms = numeric_argument(arguments, 'timeout_ms', None, float, minimum=1)
+            result = server.fetch_more(cursor_id, limit, timeout_ms)
+            return {
+                "jsonrpc": "2.0",
+                "id": request.get('id'),
+                "result": {
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": json.dumps(result, indent=2)
+                        }
+                    ]
+                }
+            }
+        
+        elif tool_name == 'close_cursor':
+            cursor_id = arguments.get('cursor_id', '')
+            result = server.close_cursor(cursor_id)
+            return {
+                "jsonrpc": "2.0",
+                "id": request.get('id'),
+                "result": {
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": json.dumps(result, indent=2)
+                        }
+                    ]
+                }
+            }
+        
+        elif tool_name == 'server_stats':
+            result = server.get_stats()
+            return {
+                "jsonrpc": "2.0",
+                "id": request.get('id'),
+                "result": {
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": json.dumps(result, indent=2)
+                        }
+                    ]
+                }
+            }
+        
         elif tool_name == 'get_schema':
             result = server.get_schema()
             return {
@@ -234,34 +1289,71 @@ def handle_mcp_request(server: SimpleSQLiteMCPServer, request: Dict[str, Any]) -
                 }
             }
         
+        elif tool_name == 'search_employees':
+            query = arguments.get('query', '')
+            limit = numeric_argument(arguments, 'limit', DEFAULT_SEARCH_LIMIT, minimum=1)
+            result = server.search_employees(query, limit)
+            return {
+                "jsonrpc": "2.0",
+                "id": request.get('id'),
+                "result": {
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": json.dumps(result, indent=2)
+                        }
+                    ]
+                }
+            }
+        
+        elif tool_name == 'explain_query':
+            query = arguments.get('query', '')
+            params = arguments.get('params')
+            result = server.explain_query(query, params)
+            return {
+                "jsonrpc": "2.0",
+                "id": request.get('id'),
+                "result": {
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": json.dumps(result, indent=2)
+                        }
+                    ]
+                }
+            }
+        
+        elif tool_name == 'insert_employees':
+            records = arguments.get('records')
+            result = server.insert_employees(records)
+            return {
+                "jsonrpc": "2.0",
+                "id": request.get('id'),
+                "result": {
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": json.dumps(result, indent=2)
+                        }
+                    ]
+                }
+            }
+        
         elif tool_name == 'insert_employee':
-            name = arguments.get('name', '')
-            department_id = arguments.get('department_id')
-            salary = arguments.get('salary')
-            hire_date = arguments.get('hire_date', '')
-            
-            # Validate required fields
-            if not all([name, department_id is not None, salary is not None, hire_date]):
-                return {
-                    "jsonrpc": "2.0",
-                    "id": request.get('id'),
-                    "result": {
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": json.dumps({"error": "All fields (name, department_id, salary, hire_date) are required"}, indent=2)
-                            }
-                        ]
-                    }
+            # Same validated, parameterized path as insert_employees, for one record
+            record = {field: arguments.get(field) for field in ('name', 'department_id', 'salary', 'hire_date')}
+            outcome = server.insert_employees([record])
+            if "error" in outcome:
+                result = outcome
+            elif "error" in outcome["results"][0]:
+                result = {"error": outcome["results"][0]["error"]}
+            else:
+                result = {
+                    "success": True,
+                    "message": "Employee inserted successfully",
+                    "id": outcome["results"][0]["id"],
+                    "affected_rows": 1
                 }
-            
-            # Create INSERT query
-            insert_query = f"""
-                INSERT INTO employees (name, department_id, salary, hire_date) 
-                VALUES ('{name}', {department_id}, {salary}, '{hire_date}')
-            """
-            
-            result = server.execute_query(insert_query)
             return {
                 "jsonrpc": "2.0",
                 "id": request.get('id'),
@@ -285,48 +1377,238 @@ def handle_mcp_request(server: SimpleSQLiteMCPServer, request: Dict[str, Any]) -
         }
     }
 
+# Tools that never write; consecutive read-only calls in a batch share one snapshot
+READ_ONLY_TOOLS = {'explain_query', 'get_schema', 'list_tables', 'search_employees', 'server_stats'}
+
+def is_read_only_request(request: Any) -> bool:
+    """Check whether a request only reads from the database."""
+    if not isinstance(request, dict):
+        return False
+    method = request.get('method', '')
+    if method in ('initialize', 'tools/list'):
+        return True
+    if method != 'tools/call':
+        return False
+    params = request.get('params') or {}
+    tool_name = params.get('name')
+    if tool_name in READ_ONLY_TOOLS:
+        return True
+    if tool_name == 'query_database':
+        query = (params.get('arguments') or {}).get('query', '')
+        return isinstance(query, str) and query.strip().upper().startswith('SELECT')
+    return False
+
+def handle_request_safely(server: SimpleSQLiteMCPServer, request: Any) -> Dict[str, Any]:
+    """Handle one request object, turning failures into JSON-RPC error responses."""
+    if not isinstance(request, dict):
+        return {
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {
+                "code": -32600,
+                "message": "Invalid Request"
+            }
+        }
+    try:
+        return handle_mcp_request(server, request)
+    except InvalidParams as e:
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get('id'),
+            "error": {
+                "code": -32602,
+                "message": str(e)
+            }
+        }
+    except Exception as e:
+        return {
+            "jsonrpc": "2.0",
+            "id": request.get('id'),
+            "error": {
+                "code": -32603,
+                "message": f"Internal error: {str(e)}"
+            }
+        }
+
+def handle_batch(server: SimpleSQLiteMCPServer, requests: List[Any]) -> Optional[List[Dict[str, Any]]]:
+    """Handle a JSON-RPC 2.0 batch, returning the response array (None if all were notifications).
+    
+    Requests run in order. Each run of consecutive read-only calls shares one
+    connection and one read snapshot.
+    """
+    if not requests:
+        return None
+    
+    responses = []
+    index = 0
+    while index < len(requests):
+        end = index
+        while end < len(requests) and is_read_only_request(requests[end]):
+            end += 1
+        if end > index:
+            group = requests[index:end]
+            group_responses = []
+            try:
+                with server.snapshot():
+                    group_responses = [(request, handle_request_safely(server, request)) for request in group]
+            except sqlite3.Error as e:
+                # Without a snapshot (e.g. the database is locked) none of the group ran
+                if not group_responses:
+                    group_responses = [
+                        (request, {
+                            "jsonrpc": "2.0",
+                            "id": request.get('id') if isinstance(request, dict) else None,
+                            "error": {
+                                "code": -32603,
+                                "message": f"Internal error: could not start a read snapshot: {str(e)}"
+                            }
+                        })
+                        for request in group
+                    ]
+            responses.extend(group_responses)
+            index = end
+        else:
+            request = requests[index]
+            responses.append((request, handle_request_safely(server, request)))
+            index += 1
+    
+    # Notifications (requests without an id) get no response in a batch
+    return [
+        response for request, response in responses
+        if not isinstance(request, dict) or 'id' in request
+    ] or None
+
+def process_line(server: SimpleSQLiteMCPServer, line: str) -> Optional[str]:
+    """Handle one line of JSON-RPC input and return the serialized response (None if there is none)."""
+    try:
+        request = json.loads(line.strip())
+    except json.JSONDecodeError:
+        return json.dumps({
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {
+                "code": -32700,
+                "message": "Parse error"
+            }
+        })
+    
+    if isinstance(request, list):
+        if not request:
+            return json.dumps({
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": -32600,
+                    "message": "Invalid Request: empty batch"
+                }
+            })
+        responses = handle_batch(server, request)
+        # The whole batch response goes out as one line, in one flush
+        return json.dumps(responses) if responses else None
+    
+    return json.dumps(handle_request_safely(server, request))
+
+def write_response(text: str):
+    """Write one response line to stdout and flush it."""
+    sys.stdout.write(text + "\n")
+    sys.stdout.flush()
+
+def serve_sequential(server: SimpleSQLiteMCPServer):
+    """Handle requests one at a time, in the order they arrive."""
+    for line in sys.stdin:
+        response = process_line(server, line)
+        if response is not None:
+            write_response(response)
+
+async def serve_concurrent(server: SimpleSQLiteMCPServer, workers: int = DEFAULT_WORKERS,
+                           max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+    """Handle requests concurrently on a bounded thread pool.
+    
+    Responses are written as soon as each request completes, so they may be
+    out of order; clients correlate them by JSON-RPC id. When max_in_flight
+    requests are pending, stdin is not read until one finishes (backpressure).
+    """
+    loop = asyncio.get_running_loop()
+    # A separate single thread reads stdin so a blocked read never stalls the workers
+    reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-stdin")
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-worker")
+    in_flight = asyncio.Semaphore(max_in_flight)
+    pending = set()
+    
+    async def handle(line: str):
+        try:
+            response = await loop.run_in_executor(executor, process_line, server, line)
+            # Only the event loop thread writes, so response lines never interleave
+            if response is not None:
+                write_response(response)
+        finally:
+            in_flight.release()
+    
+    try:
+        while True:
+            await in_flight.acquire()
+            line = await loop.run_in_executor(reader, sys.stdin.readline)
+            if not line:
+                in_flight.release()
+                break
+            task = asyncio.create_task(handle(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        
+        if pending:
+            await asyncio.gather(*pending)
+    finally:
+        executor.shutdown(wait=True)
+        reader.shutdown(wait=False)
+
 def main():
     """Main server loop for MCP communication via stdio."""
-    if len(sys.argv) != 2:
-        print("Usage: python simple_mcp_server.py <database_path>", file=sys.stderr)
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Simple MCP server for SQLite databases (JSON-RPC over stdio)")
+    parser.add_argument('database_path', help="Path to the SQLite database")
+    parser.add_argument('--concurrent', action='store_true',
+                        help="Handle requests concurrently instead of one at a time")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Worker threads in concurrent mode (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                        help=f"Maximum pending requests in concurrent mode (default: {DEFAULT_MAX_IN_FLIGHT})")
+    parser.add_argument('--slow-query-log', metavar='PATH',
+                        help="Append queries slower than --slow-query-ms to this file as JSON lines")
+    parser.add_argument('--slow-query-ms', type=float, default=DEFAULT_SLOW_QUERY_MS,
+                        help=f"Slow query threshold in milliseconds (default: {DEFAULT_SLOW_QUERY_MS:g})")
+    parser.add_argument('--query-timeout-ms', type=float, default=DEFAULT_QUERY_TIMEOUT_MS,
+                        help=f"Interrupt queries running longer than this, 0 for no limit (default: {DEFAULT_QUERY_TIMEOUT_MS:g})")
+    parser.add_argument('--max-rows', type=int, default=DEFAULT_MAX_ROWS,
+                        help=f"Most rows returned per response, 0 for no limit (default: {DEFAULT_MAX_ROWS})")
+    parser.add_argument('--max-response-bytes', type=int, default=DEFAULT_MAX_RESPONSE_BYTES,
+                        help=f"Approximate JSON size budget per response, 0 for no limit (default: {DEFAULT_MAX_RESPONSE_BYTES})")
+    parser.add_argument('--read-only-selects', action='store_true',
+                        help="Run SELECTs and other reads on separate mode=ro connections")
+    args = parser.parse_args()
     
-    db_path = sys.argv[1]
+    if args.workers < 1 or args.max_in_flight < 1:
+        parser.error("--workers and --max-in-flight must be at least 1")
     
     try:
-        server = SimpleSQLiteMCPServer(db_path)
+        server = SimpleSQLiteMCPServer(
+            args.database_path,
+            slow_query_log=args.slow_query_log,
+            slow_query_ms=args.slow_query_ms,
+            query_timeout_ms=args.query_timeout_ms,
+            max_rows=args.max_rows,
+            max_response_bytes=args.max_response_bytes,
+            read_only_selects=args.read_only_selects
+        )
         
         # MCP communication via stdin/stdout
-        for line in sys.stdin:
-            try:
-                request = json.loads(line.strip())
-                response = handle_mcp_request(server, request)
-                print(json.dumps(response))
-                sys.stdout.flush()
-            except json.JSONDecodeError:
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": None,
-                    "error": {
-                        "code": -32700,
-                        "message": "Parse error"
-                    }
-                }
-                print(json.dumps(error_response))
-                sys.stdout.flush()
-            except Exception as e:
-                error_response = {
-                    "jsonrpc": "2.0",
-                    "id": request.get('id') if 'request' in locals() else None,
-                    "error": {
-                        "code": -32603,
-                        "message": f"Internal error: {str(e)}"
-                    }
-                }
-                print(json.dumps(error_response))
-                sys.stdout.flush()
+        try:
+            if args.concurrent:
+                asyncio.run(serve_concurrent(server, args.workers, args.max_in_flight))
+            else:
+                serve_sequential(server)
+        finally:
+            server.close()
     
-    except FileNotFoundError as e:
+    except (FileNotFoundError, sqlite3.Error) as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
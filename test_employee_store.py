@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Tests for the employee data layer
+Pages through employees forward and backward over every sort column, with
+NULL salaries and hire dates and duplicate sort values present.
+"""
+
+import base64
+import importlib
+import json
+import os
+import sqlite3
+
+import pytest
+
+from employee_store import SORT_COLUMNS, EmployeeManager, encode_cursor
+from generate_employees import generate_database
+
+PAGE_SIZE = 7
+
+@pytest.fixture(scope='module')
+def db_path(tmp_path_factory):
+    """A generated database with NULLs and repeated values in the sort columns."""
+    path = str(tmp_path_factory.mktemp('store') / 'employees.db')
+    generate_database(path, 120, departments=4)
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE employees SET salary = 50000 WHERE id % 5 = 1")
+    conn.execute("UPDATE employees SET salary = NULL WHERE id % 10 = 0")
+    conn.execute("UPDATE employees SET hire_date = '2020-02-02' WHERE id % 6 = 1")
+    conn.execute("UPDATE employees SET hire_date = NULL WHERE id % 7 = 0")
+    conn.execute("UPDATE employees SET name = 'Ann Lee' WHERE id % 9 = 0")
+    conn.commit()
+    conn.close()
+    return path
+
+@pytest.fixture(scope='module')
+def manager(db_path):
+    manager = EmployeeManager(db_path, pool_size=2)
+    yield manager
+    manager.pool.close()
+
+def expected_ids(db_path, sort, order, department_id=None):
+    """The ids in page order, sorted in Python by (coalesced sort value, id)."""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT id, name, salary, hire_date, department_id FROM employees").fetchall()
+    conn.close()
+    keys = {
+        'id': lambda row: 0,
+        'name': lambda row: row[1],
+        'salary': lambda row: row[2] if row[2] is not None else 0,
+        'hire_date': lambda row: row[3] if row[3] is not None else '',
+    }
+    rows = [row for row in rows if department_id is None or row[4] == department_id]
+    ordered = sorted(rows, key=lambda row: (keys[sort](row), row[0]))
+    if order == 'desc':
+        ordered.reverse()
+    return [row[0] for row in ordered]
+
+def page_ids(page):
+    return [employee['id'] for employee in page['employees']]
+
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+@pytest.mark.parametrize('sort', list(SORT_COLUMNS))
+def test_pages_forward_and_back(manager, db_path, sort, order):
+    pages = [manager.get_employees_page(limit=PAGE_SIZE, sort=sort, order=order)]
+    while pages[-1]['next_cursor']:
+        pages.append(manager.get_employees_page(limit=PAGE_SIZE, sort=sort, order=order,
+                                                after=pages[-1]['next_cursor']))
+    forward = [employee_id for page in pages for employee_id in page_ids(page)]
+    assert forward == expected_ids(db_path, sort, order)
+    assert pages[0]['prev_cursor'] is None
+    assert all(page['prev_cursor'] and page['next_cursor'] for page in pages[1:-1])
+    assert pages[-1]['next_cursor'] is None and pages[-1]['prev_cursor']
+
+    # Walking back from the last page gives the same pages in reverse
+    page = pages[-1]
+    backward = [page_ids(page)]
+    while page['prev_cursor']:
+        page = manager.get_employees_page(limit=PAGE_SIZE, sort=sort, order=order, before=page['prev_cursor'])
+        assert page['next_cursor']
+        backward.append(page_ids(page))
+    assert backward[::-1] == [page_ids(page) for page in pages]
+
+def test_filtered_pages(manager, db_path):
+    page = manager.get_employees_page(limit=PAGE_SIZE, sort='salary', department_id=2)
+    ids = page_ids(page)
+    while page['next_cursor']:
+        page = manager.get_employees_page(limit=PAGE_SIZE, sort='salary', department_id=2,
+                                          after=page['next_cursor'])
+        ids.extend(page_ids(page))
+    assert ids == expected_ids(db_path, 'salary', 'asc', department_id=2)
+
+def raw_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+MALFORMED_CURSORS = [
+    'not a cursor!',
+    raw_cursor({'sort': 'salary'}),
+    raw_cursor(['salary', 'asc', 50000]),
+    raw_cursor(['salary', 'asc', [50000], 3]),
+    raw_cursor(['salary', 'asc', 50000, 'three']),
+    raw_cursor(['salary', 'asc', True, 3]),
+    encode_cursor('name', 'asc', 'Ann Lee', 9),
+    encode_cursor('salary', 'desc', 50000, 1),
+]
+
+@pytest.mark.parametrize('cursor', MALFORMED_CURSORS)
+def test_malformed_cursor(manager, cursor):
+    with pytest.raises(ValueError):
+        manager.get_employees_page(sort='salary', after=cursor)
+    with pytest.raises(ValueError):
+        manager.get_employees_page(sort='salary', before=cursor)
+
+@pytest.fixture(scope='module')
+def client(db_path):
+    os.environ['EMPLOYEE_DB'] = db_path
+    try:
+        app = importlib.import_module('app')
+    finally:
+        del os.environ['EMPLOYEE_DB']
+    return app.app.test_client()
+
+@pytest.mark.parametrize('cursor', MALFORMED_CURSORS)
+def test_api_rejects_malformed_cursor(client, cursor):
+    for name in ('after', 'before'):
+        response = client.get('/api/employees', query_string={'sort': 'salary', name: cursor})
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+def test_api_pages_with_cursors(client, db_path):
+    response = client.get('/api/employees', query_string={'sort': 'hire_date', 'order': 'desc', 'limit': 50})
+    first = response.get_json()
+    second = client.get('/api/employees', query_string={'sort': 'hire_date', 'order': 'desc', 'limit': 50,
+                                                        'after': first['next_cursor']}).get_json()
+    back = client.get('/api/employees', query_string={'sort': 'hire_date', 'order': 'desc', 'limit': 50,
+                                                      'before': second['prev_cursor']}).get_json()
+    assert page_ids(back) == page_ids(first)
+    assert page_ids(first) + page_ids(second) == expected_ids(db_path, 'hire_date', 'desc')[:100]
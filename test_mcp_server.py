@@ -5,9 +5,17 @@ This script tests basic functionality of the MCP server without needing a full M
 """
 
 import json
+import sqlite3
 import subprocess
 import sys
 import os
+import time
+
+import pytest
+
+from generate_employees import generate_database
+import simple_mcp_server
+from simple_mcp_server import CURSOR_IDLE_TIMEOUT, SimpleSQLiteMCPServer, handle_batch, handle_request_safely
 
 def test_python_server():
     """Test the Python MCP server implementation."""
@@ -26,8 +34,6 @@ def test_python_server():
         return False
     
     # Test basic functionality
-    from simple_mcp_server import SimpleSQLiteMCPServer
-    
     try:
         server = SimpleSQLiteMCPServer(db_path)
         
@@ -124,6 +130,202 @@ def check_database():
         print(f"❌ Database check failed: {str(e)}")
         return False
 
+@pytest.fixture
+def db_path(tmp_path):
+    """A generated employee database with 200 employees, in WAL mode as the web app leaves it."""
+    path = str(tmp_path / 'employees.db')
+    generate_database(path, 200, departments=5)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.close()
+    return path
+
+@pytest.fixture
+def server(db_path):
+    """An MCP server over db_path, closed after the test."""
+    server = SimpleSQLiteMCPServer(db_path)
+    yield server
+    server.close()
+
+def test_result_cache_hit_and_miss(server):
+    first = server.execute_query("SELECT id, name FROM employees WHERE id = ?", params=[1])
+    again = server.execute_query("SELECT id, name FROM employees WHERE id = ?;  ", params=[1])
+    other = server.execute_query("SELECT id, name FROM employees WHERE id = ?", params=[2])
+    assert "cached" not in first and again["cached"] is True
+    assert again["data"] == first["data"]
+    assert "cached" not in other and other["data"][0]["id"] == 2
+    stats = server.result_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+def test_result_cache_keeps_whitespace_in_literals(server):
+    server.execute_query("INSERT INTO employees (name, department_id, salary, hire_date) "
+                         "VALUES ('Zed Quill', 1, 50000, '2020-01-01')")
+    spaced = server.execute_query("SELECT name FROM employees WHERE name = 'Zed  Quill'")
+    single = server.execute_query("SELECT name FROM employees WHERE name = 'Zed Quill'")
+    assert spaced["data"] == []
+    assert "cached" not in single and single["data"] == [{"name": "Zed Quill"}]
+
+def test_result_cache_invalidated_by_writes(server, db_path):
+    query = "SELECT COUNT(*) AS n FROM employees"
+    assert server.execute_query(query)["data"] == [{"n": 200}]
+    server.execute_query("DELETE FROM employees WHERE id = 1")
+    assert server.execute_query(query)["data"] == [{"n": 199}]
+    # A commit from another connection is seen through PRAGMA data_version
+    assert server.execute_query(query)["cached"] is True
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM employees WHERE id = 2")
+    result = server.execute_query(query)
+    assert "cached" not in result and result["data"] == [{"n": 198}]
+
+def test_server_leaves_database_settings_alone(tmp_path):
+    path = str(tmp_path / 'rollback.db')
+    generate_database(path, 50, departments=3)
+    server = SimpleSQLiteMCPServer(path)
+    try:
+        # Employees still reference department 3; the baseline never enforced that
+        result = server.execute_query("DELETE FROM departments WHERE id = 3")
+        assert result["affected_rows"] == 1
+        assert server.execute_query("SELECT COUNT(*) AS n FROM departments")["data"] == [{"n": 2}]
+    finally:
+        server.close()
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+    finally:
+        conn.close()
+
+def test_schema_reports_expression_indexes(server, db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE INDEX idx_employees_mixed ON employees (department_id, lower(name), substr(hire_date, 1, 4) DESC) "
+                 "WHERE salary > 0")
+    conn.execute("CREATE TABLE employees_fts_archive (note TEXT)")
+    conn.commit()
+    conn.close()
+    schema = server.get_schema()
+    indexes = {index['name']: index['columns'] for index in schema['employees']['indexes']}
+    assert indexes['idx_employees_salary_sort'] == ['COALESCE(salary, 0)']
+    assert indexes['idx_employees_department_id'] == ['department_id']
+    assert indexes['idx_employees_mixed'] == ['department_id', 'lower(name)', 'substr(hire_date, 1, 4)']
+    # Real tables sharing the FTS table's prefix are listed; its shadow tables are not
+    assert schema['employees_fts']['virtual'] is True
+    assert 'employees_fts_archive' in schema
+    assert 'employees_fts_data' not in schema and 'employees_fts_config' not in schema
+
+def test_cursor_pages_to_exhaustion(server):
+    page = server.execute_query("SELECT id FROM employees ORDER BY id", limit=60)
+    ids = [row['id'] for row in page['data']]
+    while page['has_more']:
+        page = server.fetch_more(page['cursor_id'])
+        ids.extend(row['id'] for row in page['data'])
+    assert ids == list(range(1, 201))
+    assert page['rows_sent'] == 200 and 'cursor_id' not in page
+    stats = server.get_stats()
+    assert stats['open_cursors'] == 0 and stats['spare_connections'] == 1
+
+def test_cursor_closed_twice(server):
+    cursor_id = server.execute_query("SELECT id FROM employees", limit=10)['cursor_id']
+    assert server.close_cursor(cursor_id) == {"success": True, "cursor_id": cursor_id}
+    assert "error" in server.close_cursor(cursor_id)
+    assert "error" in server.fetch_more(cursor_id)
+    assert server.get_stats()['open_cursors'] == 0
+
+def test_expired_cursor(server):
+    cursor_id = server.execute_query("SELECT id FROM employees", limit=10)['cursor_id']
+    server._cursors[cursor_id].last_used = time.monotonic() - CURSOR_IDLE_TIMEOUT - 1
+    server.expire_cursors()
+    assert server.fetch_more(cursor_id) == {"error": f"Unknown or expired cursor: {cursor_id}"}
+    stats = server.get_stats()
+    assert stats['open_cursors'] == 0 and stats['spare_connections'] == 1
+
+def test_spare_connection_reused_after_cursor_closes(server):
+    first = server.execute_query("SELECT id FROM employees ORDER BY id", limit=10)
+    # The cursor keeps the thread's connection, so this query needs a second one
+    second = server.execute_query("SELECT id FROM employees WHERE id > ?", limit=10, params=[100])
+    assert server.get_stats()['connections_opened'] == 2
+    assert server.fetch_more(first['cursor_id'], limit=5)['data'][0]['id'] == 11
+    server.close_cursor(first['cursor_id'])
+    server.close_cursor(second['cursor_id'])
+    assert server.get_stats()['spare_connections'] == 2
+    for _ in range(5):
+        page = server.execute_query("SELECT id FROM employees ORDER BY id DESC", limit=10)
+        server.close_cursor(page['cursor_id'])
+    stats = server.get_stats()
+    assert stats['connections_opened'] == 2 and stats['worker_connections'] == 2
+
+def query_request(request_id, query):
+    """A JSON-RPC query_database call."""
+    return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+            "params": {"name": "query_database", "arguments": {"query": query}}}
+
+def test_batch_reads_one_snapshot(server, db_path, monkeypatch):
+    execute_query = server.execute_query
+    def execute_then_write(*args, **kwargs):
+        result = execute_query(*args, **kwargs)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO employees (name, department_id, salary, hire_date) "
+                         "VALUES ('Zed Quill', 1, 50000, '2020-01-01')")
+        return result
+    monkeypatch.setattr(server, 'execute_query', execute_then_write)
+    responses = handle_batch(server, [
+        query_request(1, "SELECT COUNT(*) AS n FROM employees"),
+        query_request(2, "SELECT COUNT(id) AS n FROM employees"),
+        query_request(3, "SELECT MAX(id) AS n FROM employees"),
+    ])
+    counts = [json.loads(response['result']['content'][0]['text'])['data'][0]['n'] for response in responses]
+    assert counts == [200, 200, 200]
+    monkeypatch.undo()
+    assert server.execute_query("SELECT COUNT(*) AS n FROM employees")['data'] == [{"n": 203}]
+
+def test_batch_on_locked_database(tmp_path, monkeypatch):
+    path = str(tmp_path / 'rollback.db')
+    generate_database(path, 50, departments=3)
+    monkeypatch.setitem(simple_mcp_server.CONNECTION_PRAGMAS, 'busy_timeout', 0)
+    server = SimpleSQLiteMCPServer(path)
+    locker = sqlite3.connect(path, isolation_level=None)
+    try:
+        locker.execute("BEGIN EXCLUSIVE")
+        responses = handle_batch(server, [query_request(1, "SELECT 1"), query_request(2, "SELECT 2")])
+        assert [response['id'] for response in responses] == [1, 2]
+        assert all("locked" in response['error']['message'] for response in responses)
+        locker.execute("ROLLBACK")
+        # The snapshot connection went back to the server and still works
+        responses = handle_batch(server, [query_request(3, "SELECT 3 AS n")])
+        assert json.loads(responses[0]['result']['content'][0]['text'])['data'] == [{"n": 3}]
+    finally:
+        locker.close()
+        server.close()
+
+SLOW_QUERY = "SELECT COUNT(*) AS n FROM employees a, employees b, employees c, employees d"
+
+def test_governor_interrupts_long_query(db_path):
+    server = SimpleSQLiteMCPServer(db_path, query_timeout_ms=100)
+    try:
+        started = time.perf_counter()
+        result = server.execute_query(SLOW_QUERY)
+        assert result == {"error": "Query interrupted: exceeded the 100 ms time limit"}
+        assert time.perf_counter() - started < 5
+        # The same thread connection keeps working after the interrupt
+        assert server.execute_query("SELECT COUNT(*) AS n FROM employees")['data'] == [{"n": 200}]
+        assert server.get_stats()['connections_opened'] == 1
+        # A call can ask for a shorter limit, but not a longer one
+        assert "20 ms" in server.execute_query(SLOW_QUERY, timeout_ms=20)['error']
+        assert "100 ms" in server.execute_query(SLOW_QUERY, timeout_ms=60000)['error']
+    finally:
+        server.close()
+
+def test_budget_arguments_are_validated(server):
+    def call(arguments):
+        return handle_request_safely(server, {"jsonrpc": "2.0", "id": 7, "method": "tools/call",
+                                              "params": {"name": "query_database", "arguments": arguments}})
+    response = call({"query": "SELECT id FROM employees ORDER BY id", "limit": "10", "timeout_ms": "5000"})
+    result = json.loads(response['result']['content'][0]['text'])
+    assert result['row_count'] == 10 and result['has_more'] is True
+    server.close_cursor(result['cursor_id'])
+    for arguments in ({"limit": "ten"}, {"limit": 2.5}, {"limit": -1}, {"limit": True},
+                      {"timeout_ms": "soon"}, {"timeout_ms": 0}, {"timeout_ms": [10]}):
+        response = call(dict(arguments, query="SELECT 1"))
+        assert response['id'] == 7 and response['error']['code'] == -32602
+
 def main():
     """Run all tests."""
     print("🚀 Testing Simple SQLite MCP Server Setup")
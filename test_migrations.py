@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for the schema migrations
+Checks the migration runner and the trigger-maintained dashboard summary
+tables, which are compared against GROUP BY queries over employees.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from generate_employees import BASE_SCHEMA_SQL
+from migrations import LATEST_VERSION, MIGRATIONS, get_schema_version, has_employee_tables, run_migrations
+
+EMPLOYEES = [
+    ('Alice Smith', 1, 60000.0, '2020-01-15'),
+    ('Bob Johnson', 2, 80000.0, '2019-03-22'),
+    ('Carol White', 2, 75000.0, '2020-07-01'),
+    ('David Brown', None, 50000.0, '2021-02-10'),
+    ('Eva Green', 3, None, None),
+]
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A migrated database with three departments and a few employees."""
+    path = str(tmp_path / 'employees.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(BASE_SCHEMA_SQL)
+    conn.executemany("INSERT INTO departments (name) VALUES (?)", [('HR',), ('Engineering',), ('Sales',)])
+    conn.executemany("INSERT INTO employees (name, department_id, salary, hire_date) VALUES (?, ?, ?, ?)",
+                     EMPLOYEES)
+    conn.commit()
+    conn.close()
+    run_migrations(path)
+    return path
+
+def summary_tables(conn):
+    """Get the non-empty rows of both summary tables."""
+    stats = {row[0]: (row[1], round(row[2], 2)) for row in conn.execute(
+        "SELECT department_id, employee_count, salary_sum FROM department_stats WHERE employee_count > 0")}
+    hires = {(row[0], row[1]): row[2] for row in conn.execute(
+        "SELECT department_id, hire_year, employee_count FROM department_hire_stats WHERE employee_count > 0")}
+    return stats, hires
+
+def expected_tables(conn):
+    """Compute the same rows directly from employees."""
+    stats = {row[0]: (row[1], round(row[2], 2)) for row in conn.execute("""
+        SELECT IFNULL(department_id, 0), COUNT(*), IFNULL(SUM(salary), 0)
+        FROM employees GROUP BY IFNULL(department_id, 0)
+    """)}
+    hires = {(row[0], row[1]): row[2] for row in conn.execute("""
+        SELECT IFNULL(department_id, 0), IFNULL(substr(hire_date, 1, 4), ''), COUNT(*)
+        FROM employees GROUP BY 1, 2
+    """)}
+    return stats, hires
+
+def assert_summaries_match(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        assert summary_tables(conn) == expected_tables(conn)
+    finally:
+        conn.close()
+
+def execute(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+def test_backfill_matches_employees(db_path):
+    assert_summaries_match(db_path)
+
+def test_insert(db_path):
+    execute(db_path, "INSERT INTO employees (name, department_id, salary, hire_date) VALUES (?, ?, ?, ?)",
+            ('Frank Black', 1, 55000.0, '2024-05-05'))
+    execute(db_path, "INSERT INTO employees (name, department_id, salary, hire_date) VALUES (?, ?, ?, ?)",
+            ('Grace Hall', None, None, None))
+    assert_summaries_match(db_path)
+
+def test_update_moves_department(db_path):
+    execute(db_path, "UPDATE employees SET department_id = 3 WHERE name = 'Bob Johnson'")
+    assert_summaries_match(db_path)
+
+def test_update_moves_hire_year(db_path):
+    execute(db_path, "UPDATE employees SET hire_date = '2018-12-31' WHERE name = 'Carol White'")
+    assert_summaries_match(db_path)
+
+def test_update_salary(db_path):
+    execute(db_path, "UPDATE employees SET salary = salary + 1000 WHERE department_id = 2")
+    assert_summaries_match(db_path)
+
+def test_update_to_and_from_no_department(db_path):
+    execute(db_path, "UPDATE employees SET department_id = NULL WHERE name = 'Alice Smith'")
+    assert_summaries_match(db_path)
+    execute(db_path, "UPDATE employees SET department_id = 1 WHERE name = 'David Brown'")
+    assert_summaries_match(db_path)
+
+def test_update_of_other_columns_keeps_counts(db_path):
+    execute(db_path, "UPDATE employees SET name = 'Alice Jones' WHERE name = 'Alice Smith'")
+    assert_summaries_match(db_path)
+
+def test_delete(db_path):
+    execute(db_path, "DELETE FROM employees WHERE name IN ('Bob Johnson', 'David Brown', 'Eva Green')")
+    assert_summaries_match(db_path)
+    execute(db_path, "DELETE FROM employees")
+    assert_summaries_match(db_path)
+
+def test_migrations_are_numbered_in_order():
+    versions = [version for version, _, _ in MIGRATIONS]
+    assert versions == list(range(1, len(MIGRATIONS) + 1))
+    assert LATEST_VERSION == versions[-1]
+
+def test_runner_applies_every_migration_once(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        assert get_schema_version(conn) == LATEST_VERSION
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {'idx_employees_department_id', 'idx_employees_salary_sort'} <= indexes
+    finally:
+        conn.close()
+    assert run_migrations(db_path) == (LATEST_VERSION, LATEST_VERSION)
+    assert_summaries_match(db_path)
+
+def test_runner_resumes_from_an_older_version(db_path):
+    execute(db_path, "DROP INDEX idx_employees_salary_sort")
+    execute(db_path, f"PRAGMA user_version = {LATEST_VERSION - 1}")
+    assert run_migrations(db_path) == (LATEST_VERSION - 1, LATEST_VERSION)
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_employees_salary_sort'").fetchone()
+    finally:
+        conn.close()
+
+def test_concurrent_runners_apply_migrations_once(tmp_path):
+    path = str(tmp_path / 'fresh.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(BASE_SCHEMA_SQL)
+    conn.execute("INSERT INTO employees (name, department_id, salary, hire_date) VALUES ('Ann Lee', NULL, 1, '2020-01-01')")
+    conn.commit()
+    conn.close()
+
+    results, errors = [], []
+    def migrate():
+        try:
+            results.append(run_migrations(path))
+        except sqlite3.Error as e:
+            errors.append(e)
+    threads = [threading.Thread(target=migrate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert all(after == LATEST_VERSION for _, after in results)
+    # A second backfill would have doubled the counts
+    assert_summaries_match(path)
+
+def test_failed_migration_rolls_back(tmp_path):
+    path = str(tmp_path / 'broken.db')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE employees (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("CREATE TABLE departments (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+    with pytest.raises(sqlite3.DatabaseError, match="Migration 1"):
+        run_migrations(path)
+    conn = sqlite3.connect(path)
+    try:
+        assert get_schema_version(conn) == 0
+        assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'department_stats'").fetchone()
+    finally:
+        conn.close()
+
+def test_has_employee_tables(db_path, tmp_path):
+    other = str(tmp_path / 'other.db')
+    conn = sqlite3.connect(other)
+    conn.execute("CREATE TABLE notes (body TEXT)")
+    conn.commit()
+    conn.close()
+    assert has_employee_tables(db_path)
+    assert not has_employee_tables(other)